@@ -9,11 +9,40 @@ This module maintains API compatibility with the bash library while using
 proper data structures (dataclasses) instead of nameref pass-by-reference.
 """
 
+import atexit
 import json
+import os
+import re
 import subprocess
 import sys
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
 from enum import Enum
+from functools import lru_cache
+from types import SimpleNamespace
+
+# JSON serialization: orjson is an optional dependency with a stdlib fallback.
+# WHY: to_json runs on every branch listing; orjson walks dataclass fields in C
+# instead of building intermediate dicts in Python. Both paths emit the same
+# compact UTF-8 text (field order follows the dataclass definitions).
+#
+# The stdlib serializer is defined at module level (always present) so tests
+# can pin its behavior even when orjson is installed.
+
+
+def _json_dumps_stdlib(obj) -> str:
+    """Fallback serializer producing the same text as the orjson path."""
+    return json.dumps(asdict(obj), ensure_ascii=False, separators=(",", ":"))
+
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_DATACLASS).decode()
+
+except ImportError:
+    _json_dumps = _json_dumps_stdlib
 
 
 class BranchType(Enum):
@@ -24,7 +53,7 @@ class BranchType(Enum):
     WIP = "wip"
 
 
-@dataclass
+@dataclass(slots=True)
 class BranchInfo:
     """Single branch information."""
 
@@ -36,7 +65,7 @@ class BranchInfo:
     remote_ref: str = ""  # Full remote ref for remote branches
 
 
-@dataclass
+@dataclass(slots=True)
 class BranchDetails:
     """Complete branch listing result."""
 
@@ -50,23 +79,7 @@ class BranchDetails:
         Returns a JSON object with current_branch, max_len, and branches array.
         Each branch has name, hash, date, subject, track, and remote_ref fields.
         """
-        return json.dumps(
-            {
-                "current_branch": self.current_branch,
-                "max_len": self.max_len,
-                "branches": [
-                    {
-                        "name": b.name,
-                        "hash": b.hash,
-                        "date": b.date,
-                        "subject": b.subject,
-                        "track": b.track,
-                        "remote_ref": b.remote_ref,
-                    }
-                    for b in self.branches
-                ],
-            }
-        )
+        return _json_dumps(self)
 
     def to_bash_declare(self) -> str:
         """Format as bash variable declarations.
@@ -84,49 +97,58 @@ class BranchDetails:
         All strings are properly escaped for safe bash evaluation.
         Arrays maintain consistent lengths (all same size).
         """
-        lines = []
-
-        # Scalar variables
-        lines.append(f"declare current_branch={_bash_escape(self.current_branch)}")
-        lines.append(f"declare max_len={self.max_len}")
-
-        # Build arrays - use space-separated values for bash arrays
-        branches_arr = " ".join(_bash_escape(b.name) for b in self.branches)
-        hashes_arr = " ".join(_bash_escape(b.hash) for b in self.branches)
-        dates_arr = " ".join(_bash_escape(b.date) for b in self.branches)
-        tracks_arr = " ".join(_bash_escape(b.track) for b in self.branches)
-        subjects_arr = " ".join(_bash_escape(b.subject) for b in self.branches)
-
-        lines.append(f"declare -a branches=({branches_arr})")
-        lines.append(f"declare -a hashes=({hashes_arr})")
-        lines.append(f"declare -a dates=({dates_arr})")
-        lines.append(f"declare -a tracks=({tracks_arr})")
-        lines.append(f"declare -a subjects=({subjects_arr})")
+        branches = self.branches
+
+        # Scalars first, then one array per field. str.join is handed lists
+        # (not generators) so it can size the result in a single allocation.
+        lines = [
+            f"declare current_branch={_bash_escape(self.current_branch)}",
+            f"declare max_len={self.max_len}",
+            f"declare -a branches=({' '.join([_bash_escape(b.name) for b in branches])})",
+            f"declare -a hashes=({' '.join([_bash_escape(b.hash) for b in branches])})",
+            f"declare -a dates=({' '.join([_bash_escape(b.date) for b in branches])})",
+            f"declare -a tracks=({' '.join([_bash_escape(b.track) for b in branches])})",
+            f"declare -a subjects=({' '.join([_bash_escape(b.subject) for b in branches])})",
+        ]
 
         # Add remote_refs array if any branch has a remote_ref (for remote branches)
-        if any(b.remote_ref for b in self.branches):
-            remote_refs_arr = " ".join(_bash_escape(b.remote_ref) for b in self.branches)
+        if any(b.remote_ref for b in branches):
+            remote_refs_arr = " ".join([_bash_escape(b.remote_ref) for b in branches])
             lines.append(f"declare -a remote_refs=({remote_refs_arr})")
 
         return "\n".join(lines)
 
 
+# Replacements for _bash_escape, applied in a single scan of the input.
+_BASH_ESC = {"\\": "\\\\", "'": "'\\''"}
+_BASH_ESC_RE = re.compile(r"[\\']")
+
+
 def _bash_escape(s: str) -> str:
     """Escape string for safe bash declare usage.
 
     Uses single quotes with inner quote escaping for maximum compatibility.
     Handles: backslashes, single quotes, and most special characters.
 
-    Strategy: '...' with '\'' for embedded single quotes.
+    Strategy: '...' with '\'' for embedded single quotes. Backslashes and
+    quotes are replaced in one regex pass (no intermediate strings). Most
+    inputs (branch names, hashes, dates) contain neither, so two C-level
+    substring scans short-circuit the regex entirely.
     """
-    s = s.replace("\\", "\\\\")  # Backslashes first (order matters)
-    s = s.replace("'", "'\\''")  # Single quotes
-    return f"'{s}'"
+    if not s:
+        return "''"
+    if "'" not in s and "\\" not in s:
+        return "'" + s + "'"
+    return "'" + _BASH_ESC_RE.sub(lambda m: _BASH_ESC[m.group(0)], s) + "'"
 
 
 def _run_git(args: list[str], check: bool = True) -> str:
     """Run git command and return stdout.
 
+    Results are memoized per (args, check) until the next public query
+    clears the cache, so repeated read-only queries spawn git only once.
+    Failures raise before anything is cached.
+
     Args:
         args: Git command arguments (without 'git' prefix)
         check: If True, raise CalledProcessError on non-zero exit
@@ -137,15 +159,90 @@ def _run_git(args: list[str], check: bool = True) -> str:
     Raises:
         subprocess.CalledProcessError: If command fails and check=True
     """
-    result = subprocess.run(["git"] + args, capture_output=True, text=True, check=check)
-    return result.stdout.rstrip("\n\r")
+    return _run_git_cached(tuple(args), check)
+
+
+# Config overrides passed to every git call. core.commitGraph lets ancestry
+# walks (%(upstream:track), rev-list --count) use the commit-graph file when
+# the repo has one, even if a user config disabled it. Read-only: writing the
+# graph is left to git gc / git maintenance.
+_GIT_CONFIG_ARGS = ("-c", "core.commitGraph=true")
+
+
+# Full ref prefix of local hug backup branches, excluded from listings by default.
+_LOCAL_BACKUP_PREFIX = "refs/heads/hug-backups/"
+
+# Decode git output as UTF-8 (git's default for refnames and commit subjects)
+# instead of text=True's locale lookup. Undecodable bytes become U+FFFD rather
+# than aborting the whole listing. Captured output is read as bytes and decoded
+# once here, skipping subprocess's newline translation and stderr decoding.
+_GIT_TEXT_KWARGS = {"encoding": "utf-8", "errors": "replace"}
+
+# Read size for streamed git output (see _run_git_stream).
+_STREAM_CHUNK_SIZE = 65536
+
+
+def _git_argv(args: Iterable[str]) -> list[str]:
+    """Build the full git argv, including the shared config overrides."""
+    return ["git", *_GIT_CONFIG_ARGS, *args]
+
+
+@lru_cache(maxsize=64)
+def _run_git_cached(args: tuple[str, ...], check: bool) -> str:
+    """Uncached git execution behind _run_git (keyed on a hashable argv)."""
+    result = subprocess.run(_git_argv(args), capture_output=True, check=check)
+    return result.stdout.decode(**_GIT_TEXT_KWARGS).rstrip("\n\r")
+
+
+def _decode_field(raw: bytes) -> str:
+    """Decode one raw field, dropping the newline git writes between records."""
+    if raw.startswith(b"\n"):
+        raw = raw[1:]
+    return raw.decode(**_GIT_TEXT_KWARGS)
+
+
+def _run_git_stream(args: list[str]) -> Iterator[str]:
+    """Run git and yield null-delimited fields as its stdout arrives.
+
+    Parsing overlaps with git's ref walk, and the full output is never held
+    in memory as one string. Stdout is read as bytes and split on NUL before
+    decoding, so each field is decoded exactly once and a multi-byte
+    character can never be cut by a read boundary. Errors are ignored like
+    _run_git(check=False): a failing command simply yields whatever it printed.
+
+    Args:
+        args: Git command arguments (without 'git' prefix)
+
+    Yields:
+        Field values, with record-terminating newlines removed
+    """
+    with subprocess.Popen(
+        _git_argv(args), stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ) as proc:
+        pending = b""
+        received = False
+        for chunk in iter(lambda: proc.stdout.read(_STREAM_CHUNK_SIZE), b""):
+            received = True
+            *fields, pending = (pending + chunk).split(b"\0")
+            for field in fields:
+                yield _decode_field(field)
+        if received:
+            yield _decode_field(pending.rstrip(b"\n\r"))
+
+
+def _iter_records(fields: Iterable[str], size: int) -> Iterator[tuple[str, ...]]:
+    """Group a flat field stream into fixed-size records.
+
+    A trailing partial record (e.g. the empty field after the final %00) is dropped.
+    """
+    return zip(*[iter(fields)] * size, strict=False)
 
 
 def _run_git_for_each_ref(
     format_str: str,
     ref_pattern: str,
     sort_ascending: bool = False,
-) -> list[str]:
+) -> Iterator[str]:
     """Run git for-each-ref with null-delimited output.
 
     Args:
@@ -155,23 +252,35 @@ def _run_git_for_each_ref(
                         True = ascending (oldest first)
 
     Returns:
-        List of null-delimited field values
+        Lazy stream of field values for all refs, in record order. Callers
+        group it into fixed-size records with _iter_records (one field per
+        %00 in format_str).
+
+    Note:
+        All refs come back from a single subprocess. for-each-ref has no -z
+        option and always terminates each record with a newline, so a format
+        ending in %00 yields "\\0\\n" at record boundaries. That newline is
+        removed here so fields never carry record framing.
+    """
+    return _run_git_for_each_ref_multi(format_str, [ref_pattern], sort_ascending)
+
+
+def _run_git_for_each_ref_multi(
+    format_str: str,
+    ref_patterns: list[str],
+    sort_ascending: bool = False,
+) -> Iterator[str]:
+    """Run one git for-each-ref over several ref patterns.
+
+    Same as _run_git_for_each_ref, but every pattern is passed positionally
+    to a single subprocess. Records from all patterns come back interleaved
+    in sort order; include %(refname) in format_str to tell them apart.
     """
     # Git for-each-ref sorting: -committerdate = descending (newest first),
     # committerdate = ascending (oldest first)
     sort_prefix = "-" if not sort_ascending else ""
-    output = _run_git(
-        [
-            "for-each-ref",
-            "--format=" + format_str,
-            f"--sort={sort_prefix}committerdate",
-            ref_pattern,
-        ],
-        check=False,
-    )
-    if not output:
-        return []
-    return output.split("\0")
+    args = ["for-each-ref", "--format=" + format_str, f"--sort={sort_prefix}committerdate"]
+    return _run_git_stream(args + ref_patterns)
 
 
 def _sanitize_string(s: str) -> str:
@@ -179,13 +288,56 @@ def _sanitize_string(s: str) -> str:
 
     Critical for robust string comparisons in branch names and subjects.
     Removes newlines, carriage returns, and other whitespace from both ends.
+
+    A single argument-less str.strip() already treats \\r, \\v and \\f as
+    whitespace, so no separate carriage-return pass or custom charset is needed.
     """
     return s.strip()
 
 
+def _format_divergence(ahead: str, behind: str) -> tuple[str, str, str]:
+    """Build the (status_string, ahead, behind) tuple from raw counts."""
+    if ahead != "0" and behind != "0":
+        return f"[ahead {ahead}, behind {behind}]", ahead, behind
+    elif ahead != "0":
+        return f"[ahead {ahead}]", ahead, behind
+    elif behind != "0":
+        return f"[behind {behind}]", ahead, behind
+
+    return "", ahead, behind
+
+
+def _parse_track(track: str) -> tuple[str, str, str]:
+    """Parse git's %(upstream:track) field into divergence info.
+
+    Git computes the counts while listing refs, so no extra subprocess is
+    needed. "[gone]" and an in-sync (empty) track report no divergence.
+
+    Args:
+        track: Raw %(upstream:track) value (e.g., "[ahead 2, behind 1]")
+
+    Returns:
+        Tuple of (status_string, ahead, behind), same shape as _compute_divergence
+    """
+    ahead = behind = "0"
+    for part in track.strip("[]").split(", "):
+        kind, _, count = part.partition(" ")
+        if not count.isdecimal():
+            continue
+        if kind == "ahead":
+            ahead = count
+        elif kind == "behind":
+            behind = count
+    return _format_divergence(ahead, behind)
+
+
 def _compute_divergence(branch: str, upstream: str) -> tuple[str, str, str]:
     """Compute ahead/behind divergence for a branch relative to upstream.
 
+    Spawns one git rev-list per call. Branch listings read divergence from
+    for-each-ref's %(upstream:track) instead (see _parse_track); use this for
+    arbitrary branch pairs that are not upstream-tracked.
+
     Args:
         branch: Local branch name
         upstream: Upstream branch name
@@ -198,23 +350,12 @@ def _compute_divergence(branch: str, upstream: str) -> tuple[str, str, str]:
         divergence = _run_git(
             ["rev-list", "--left-right", "--count", f"{branch}...{upstream}"], check=False
         )
-        if not divergence:
-            return "", "0", "0"
-
-        parts = divergence.split("\t")
-        if len(parts) != 2:
+        # `rev-list --left-right --count` prints "<ahead>\t<behind>"
+        counts = divergence.split()
+        if len(counts) != 2 or not (counts[0].isdecimal() and counts[1].isdecimal()):
             return "", "0", "0"
 
-        ahead, behind = parts[0], parts[1]
-
-        if ahead != "0" and behind != "0":
-            return f"[ahead {ahead}, behind {behind}]", ahead, behind
-        elif ahead != "0":
-            return f"[ahead {ahead}]", ahead, behind
-        elif behind != "0":
-            return f"[behind {behind}]", ahead, behind
-
-        return "", ahead, behind
+        return _format_divergence(counts[0], counts[1])
     except subprocess.CalledProcessError:
         return "", "0", "0"
 
@@ -230,7 +371,7 @@ def get_local_branch_details(
     Args:
         include_subjects: Include commit subject messages
         exclude_backup: Exclude hug-backup/* branches
-        batch_divergence: Use parallel divergence calculation for 5+ branches
+        batch_divergence: Include ahead/behind counts in track strings
         sort_ascending: Sort order - False = descending (newest first),
                         True = ascending (oldest first)
 
@@ -240,6 +381,8 @@ def get_local_branch_details(
     Raises:
         subprocess.CalledProcessError: If git commands fail
     """
+    _run_git_cached.cache_clear()  # Each query sees current refs
+
     # Get current branch
     current_branch = _run_git(["branch", "--show-current"], check=False)
     if not current_branch:
@@ -253,50 +396,54 @@ def get_local_branch_details(
 
     # Get branch data
     git_output = _run_git_for_each_ref(format_str, "refs/heads/", sort_ascending)
-    if not git_output:
-        return None
-
-    branches: list[BranchInfo] = []
-    max_len = 0
-    divergence_commands: list[tuple[int, str, str]] = []  # (index, branch, upstream)
 
     # Parse output in chunks
     # Format: branch, hash, date, [subject], upstream, track
     # chunk_size = 6 with subjects, 5 without
-    chunk_size = 6 if include_subjects else 5
-    for i in range(0, len(git_output) - chunk_size + 1, chunk_size):
-        branch = _sanitize_string(git_output[i])
-        hash_val = git_output[i + 1]
-        date_val = git_output[i + 2]  # NEW: date field
+    records: Iterable[tuple[str, ...]]
+    if include_subjects:
+        records = _iter_records(git_output, 6)
+    else:
+        records = ((b, h, d, "", u, t) for b, h, d, u, t in _iter_records(git_output, 5))
+
+    return _build_local_details(records, current_branch, exclude_backup, batch_divergence)
+
+
+def _build_local_details(
+    records: Iterable[tuple[str, ...]],
+    current_branch: str,
+    exclude_backup: bool,
+    batch_divergence: bool,
+) -> BranchDetails | None:
+    """Build local BranchDetails from (branch, hash, date, subject, upstream, track) records."""
+    branches: list[BranchInfo] = []
+    max_len = 0
+
+    for branch, hash_val, date_val, subject, upstream, track_field in records:
+        branch = _sanitize_string(branch)
 
         # Skip backup branches
         if exclude_backup and branch.startswith("hug-backups/"):
             continue
 
-        subject = ""
-        if include_subjects:
-            subject = _sanitize_string(git_output[i + 3])
-            upstream_idx = i + 4
-            track_idx = i + 5
-        else:
-            upstream_idx = i + 3
-            track_idx = i + 4
-
-        upstream = _sanitize_string(git_output[upstream_idx])
-        _sanitize_string(git_output[track_idx])
+        subject = _sanitize_string(subject)
+        upstream = _sanitize_string(upstream)
 
         # Update max length
         if len(branch) > max_len:
             max_len = len(branch)
 
-        # Store upstream info for divergence calculation
-        if upstream and batch_divergence:
-            divergence_commands.append((len(branches), branch, upstream))
-
-        # Build initial track string (without divergence info)
+        # Build track string: [upstream] or [upstream: ahead N, behind M].
+        # Divergence comes from %(upstream:track), computed by for-each-ref itself
         track = ""
         if upstream:
             track = f"[{upstream}]"
+            if batch_divergence:
+                status, _, _ = _parse_track(track_field)
+                if status:
+                    track = f"[{upstream}: {status}]"
+            # Many branches share an upstream; keep one copy of each track string
+            track = sys.intern(track)
 
         branches.append(
             BranchInfo(
@@ -311,23 +458,6 @@ def get_local_branch_details(
     if not branches:
         return None
 
-    # Batch compute divergence if requested and there are upstreams
-    divergence_results: dict[int, str] = {}
-
-    if batch_divergence and divergence_commands:
-        for idx, branch, upstream in divergence_commands:
-            status, _, _ = _compute_divergence(branch, upstream)
-            if status:
-                # Replace simple [upstream] with [upstream: status]
-                divergence_results[idx] = status
-
-    # Update track strings with divergence info
-    for idx, branch_info in enumerate(branches):
-        if idx in divergence_results:
-            # Add divergence info to track string
-            upstream_name = branch_info.track[1:-1]  # Remove [ and ]
-            branch_info.track = f"[{upstream_name}: {divergence_results[idx]}]"
-
     return BranchDetails(
         current_branch=current_branch,
         max_len=max_len,
@@ -351,6 +481,8 @@ def get_remote_branch_details(
     Returns:
         BranchDetails object or None if no remote branches exist
     """
+    _run_git_cached.cache_clear()  # Each query sees current refs
+
     # Build format string
     format_str = "%(refname:short)%00%(objectname:short)%00%(committerdate:short)"
     if include_subjects:
@@ -359,18 +491,28 @@ def get_remote_branch_details(
 
     # Get remote branch data
     git_output = _run_git_for_each_ref(format_str, "refs/remotes/", sort_ascending)
-    if not git_output:
-        return None
-
-    branches: list[BranchInfo] = []
-    max_len = 0
 
     # Parse output in chunks
     # Format: remote_ref, hash, date, [subject]
     # chunk_size = 4 with subjects, 3 without
-    chunk_size = 4 if include_subjects else 3
-    for i in range(0, len(git_output) - chunk_size + 1, chunk_size):
-        remote_ref = _sanitize_string(git_output[i])
+    records: Iterable[tuple[str, ...]]
+    if include_subjects:
+        records = _iter_records(git_output, 4)
+    else:
+        records = ((r, h, d, "") for r, h, d in _iter_records(git_output, 3))
+
+    return _build_remote_details(records, exclude_backup)
+
+
+def _build_remote_details(
+    records: Iterable[tuple[str, ...]], exclude_backup: bool
+) -> BranchDetails | None:
+    """Build remote BranchDetails from (remote_ref, hash, date, subject) records."""
+    branches: list[BranchInfo] = []
+    max_len = 0
+
+    for remote_ref, hash_val, date_val, subject in records:
+        remote_ref = sys.intern(_sanitize_string(remote_ref))
 
         # Skip HEAD references
         if not remote_ref or remote_ref.endswith("/HEAD"):
@@ -380,18 +522,11 @@ def get_remote_branch_details(
         if exclude_backup and remote_ref.startswith("hug-backups/"):
             continue
 
-        hash_val = git_output[i + 1]
-        date_val = git_output[i + 2]  # NEW: date field
-
-        subject = ""
-        if include_subjects:
-            subject = _sanitize_string(git_output[i + 3])
+        subject = _sanitize_string(subject)
 
         # Extract local branch name by stripping remote prefix (e.g., "origin/feature" -> "feature")
-        parts = remote_ref.split("/", 1)
-        branch = parts[1] if len(parts) > 1 else remote_ref
-
-        if not branch or branch == remote_ref:
+        branch = remote_ref.partition("/")[2]
+        if not branch:
             continue
 
         if len(branch) > max_len:
@@ -417,6 +552,112 @@ def get_remote_branch_details(
     )
 
 
+def get_all_branch_details(
+    include_subjects: bool = True,
+    exclude_backup: bool = True,
+    sort_ascending: bool = False,
+) -> tuple[BranchDetails | None, BranchDetails | None]:
+    """Get local and remote branch details from a single git subprocess.
+
+    One for-each-ref walks refs/heads/ and refs/remotes/ together and the
+    records are partitioned by refname prefix, so git starts once instead of
+    once per namespace. %(HEAD) marks the current branch, which saves the
+    separate `git branch --show-current` call whenever HEAD is on a listed
+    branch.
+
+    Args:
+        include_subjects: Include commit subject messages
+        exclude_backup: Exclude hug-backup/* branches
+        sort_ascending: Sort order - False = descending (newest first),
+                        True = ascending (oldest first)
+
+    Returns:
+        Tuple of (local, remote) results, each as returned by
+        get_local_branch_details / get_remote_branch_details
+
+    Raises:
+        subprocess.CalledProcessError: If git commands fail
+    """
+    return _get_branch_namespaces(include_subjects, exclude_backup, sort_ascending)[:2]
+
+
+def _shares_ref_listing(wip_pattern: str) -> bool:
+    """Whether _get_branch_namespaces can carve wip_pattern out of its listing.
+
+    True for plain prefixes under refs/heads/ that the backup exclusion
+    cannot touch, so filtering by prefix gives exactly the refs a separate
+    for-each-ref on wip_pattern would list.
+    """
+    return (
+        wip_pattern.startswith("refs/heads/")
+        and wip_pattern.endswith("/")
+        and not any(c in wip_pattern for c in "*?[")
+        and not wip_pattern.startswith(_LOCAL_BACKUP_PREFIX)
+        and not _LOCAL_BACKUP_PREFIX.startswith(wip_pattern)
+    )
+
+
+def _get_branch_namespaces(
+    include_subjects: bool = True,
+    exclude_backup: bool = True,
+    sort_ascending: bool = False,
+    wip_pattern: str | None = None,
+) -> tuple[BranchDetails | None, BranchDetails | None, BranchDetails | None]:
+    """Local, remote and (optionally) WIP details from one for-each-ref.
+
+    WIP branches are local branches too, so when wip_pattern passes
+    _shares_ref_listing they are picked out of the same records by prefix
+    instead of listing refs again. The WIP result is None when wip_pattern
+    is None.
+    """
+
+    _run_git_cached.cache_clear()  # Each query sees current refs
+
+    # Format: refname, HEAD marker, short name, hash, date, [subject], upstream, track
+    # (upstream fields are empty for remote refs)
+    format_str = (
+        "%(refname)%00%(HEAD)%00%(refname:short)%00%(objectname:short)%00%(committerdate:short)"
+    )
+    if include_subjects:
+        format_str += "%00%(subject)"
+    format_str += "%00%(upstream:short)%00%(upstream:track)%00"
+
+    git_output = _run_git_for_each_ref_multi(
+        format_str, ["refs/heads/", "refs/remotes/"], sort_ascending
+    )
+
+    local_records: list[tuple[str, ...]] = []
+    remote_records: list[tuple[str, ...]] = []
+    wip_records: list[tuple[str, ...]] = []
+    current_branch = ""
+    chunk_size = 8 if include_subjects else 7
+    for record in _iter_records(git_output, chunk_size):
+        if include_subjects:
+            refname, head, short, hash_val, date_val, subject, upstream, track_field = record
+        else:
+            refname, head, short, hash_val, date_val, upstream, track_field = record
+            subject = ""
+        if wip_pattern and refname.startswith(wip_pattern):
+            wip_records.append((short, hash_val, date_val, subject))
+        if refname.startswith("refs/remotes/"):
+            remote_records.append((short, hash_val, date_val, subject))
+            continue
+        if head == "*":
+            current_branch = _sanitize_string(short)
+        local_records.append((short, hash_val, date_val, subject, upstream, track_field))
+
+    # HEAD is detached or unborn: ask git directly
+    if not current_branch:
+        current_branch = _run_git(["branch", "--show-current"], check=False)
+        if not current_branch:
+            current_branch = "detached HEAD"
+
+    local = _build_local_details(local_records, current_branch, exclude_backup, True)
+    remote = _build_remote_details(remote_records, exclude_backup)
+    wip = _build_wip_details(wip_records) if wip_pattern else None
+    return local, remote, wip
+
+
 def get_wip_branch_details(
     include_subjects: bool = True,
     ref_pattern: str = "refs/heads/WIP/",
@@ -433,33 +674,35 @@ def get_wip_branch_details(
     Returns:
         BranchDetails object with branches matching WIP patterns
     """
+    _run_git_cached.cache_clear()  # Each query sees current refs
+
     format_str = "%(refname:short)%00%(objectname:short)%00%(committerdate:short)"
     if include_subjects:
         format_str += "%00%(subject)"
     format_str += "%00"
 
     git_output = _run_git_for_each_ref(format_str, ref_pattern, sort_ascending)
-    if not git_output:
-        return None
-
-    branches: list[BranchInfo] = []
-    max_len = 0
 
     # Parse output in chunks
     # Format: branch, hash, date, [subject]
     # chunk_size = 4 with subjects, 3 without
-    chunk_size = 4 if include_subjects else 3
-    for i in range(0, len(git_output) - chunk_size + 1, chunk_size):
-        branch = _sanitize_string(git_output[i])
+    records = _iter_records(git_output, 4 if include_subjects else 3)
+    if not include_subjects:
+        records = ((*record, "") for record in records)
+    return _build_wip_details(records)
+
+
+def _build_wip_details(records: Iterable[tuple[str, ...]]) -> BranchDetails | None:
+    """Build WIP BranchDetails from (branch, hash, date, subject) records."""
+    branches: list[BranchInfo] = []
+    max_len = 0
+
+    for branch, hash_val, date_val, subject in records:
+        branch = _sanitize_string(branch)
         if not branch:
             continue
 
-        hash_val = git_output[i + 1]
-        date_val = git_output[i + 2]  # NEW: date field
-
-        subject = ""
-        if include_subjects:
-            subject = _sanitize_string(git_output[i + 3])
+        subject = _sanitize_string(subject)
 
         if len(branch) > max_len:
             max_len = len(branch)
@@ -483,6 +726,67 @@ def get_wip_branch_details(
     )
 
 
+# Characters git forbids in refnames (git check-ref-format) that cat-file
+# would instead read as revision syntax or as batch framing.
+_NON_REF_CHARS = frozenset("~^:?*[\\ \t\n")
+
+
+class _GitRefResolver:
+    """Answer ref existence queries from one long-running git cat-file.
+
+    Each lookup is a line written to `git cat-file --batch-check` rather
+    than a new `git show-ref --verify` process. The process is started on
+    first use, restarted if the repository it would see changes (working
+    directory, GIT_DIR or GIT_WORK_TREE), and closed at exit.
+    """
+
+    def __init__(self) -> None:
+        self._proc: subprocess.Popen | None = None
+        self._repo_key: tuple[str, str | None, str | None] | None = None
+
+    def exists(self, ref: str) -> bool:
+        """Return True if the full refname (e.g. refs/remotes/origin/main) exists."""
+        if not ref or ".." in ref or "@{" in ref or not _NON_REF_CHARS.isdisjoint(ref):
+            return False  # Not a valid refname, so no such ref
+        proc = self._process()
+        try:
+            proc.stdin.write(ref + "\n")
+            proc.stdin.flush()
+            line = proc.stdout.readline()
+        except OSError:
+            line = ""
+        if not line:  # git exited (e.g. not a repository)
+            self.close()
+            return False
+        # Found: "<objectname>"; otherwise "<ref> missing" / "<ref> ambiguous"
+        return " " not in line.strip()
+
+    def close(self) -> None:
+        """Stop the cat-file process, if running."""
+        proc, self._proc = self._proc, None
+        if proc is not None:
+            proc.stdin.close()
+            proc.wait()
+
+    def _process(self) -> subprocess.Popen:
+        repo_key = (os.getcwd(), os.environ.get("GIT_DIR"), os.environ.get("GIT_WORK_TREE"))
+        if self._proc is None or self._proc.poll() is not None or repo_key != self._repo_key:
+            self.close()
+            self._proc = subprocess.Popen(
+                _git_argv(["cat-file", "--batch-check=%(objectname)"]),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                **_GIT_TEXT_KWARGS,
+            )
+            self._repo_key = repo_key
+        return self._proc
+
+
+_ref_resolver = _GitRefResolver()
+atexit.register(_ref_resolver.close)
+
+
 def find_remote_branch(branch_name: str) -> str | None:
     """Find a remote branch matching the given branch name.
 
@@ -496,13 +800,11 @@ def find_remote_branch(branch_name: str) -> str | None:
         If multiple remotes have the same branch, prefers "origin" if available,
         otherwise returns the first match alphabetically.
     """
+    _run_git_cached.cache_clear()  # Each query sees current refs
+
     # If branch_name already looks like a remote ref, check if it exists
-    if "/" in branch_name:
-        try:
-            _run_git(["show-ref", "--verify", "--quiet", f"refs/remotes/{branch_name}"])
-            return branch_name
-        except subprocess.CalledProcessError:
-            pass
+    if "/" in branch_name and _ref_resolver.exists(f"refs/remotes/{branch_name}"):
+        return branch_name
 
     # Get all remote branches, excluding HEAD
     output = _run_git(["for-each-ref", "--format=%(refname:short)", "refs/remotes/"])
@@ -511,7 +813,9 @@ def find_remote_branch(branch_name: str) -> str | None:
     # Find matches
     matches = []
     for remote_ref in remote_refs:
-        ref_branch = remote_ref.split("/", 1)[1] if "/" in remote_ref else remote_ref
+        _, sep, ref_branch = remote_ref.partition("/")
+        if not sep:
+            ref_branch = remote_ref
         if ref_branch == branch_name:
             matches.append(remote_ref)
 
@@ -530,37 +834,98 @@ def find_remote_branch(branch_name: str) -> str | None:
     return sorted(matches, key=str.lower)[0]
 
 
-# CLI entry point for direct invocation from bash
-def main():
-    """CLI entry point for bash wrapper calls.
+def _get_all_modes(
+    wip_pattern: str = "refs/heads/WIP/", sort_ascending: bool = False
+) -> dict[str, BranchDetails | None]:
+    """Query local, remote and WIP branches with as few git calls as possible.
 
-    Usage:
-        python3 -m hug_git_branch <type> [options]
+    With the default WIP prefix all three modes come from one for-each-ref.
+    A pattern that listing cannot answer exactly gets its own for-each-ref
+    on a worker thread, so wall time is the slower of the two git processes
+    rather than their sum.
+    """
+    if _shares_ref_listing(wip_pattern):
+        local, remote, wip = _get_branch_namespaces(
+            include_subjects=True,
+            exclude_backup=True,
+            sort_ascending=sort_ascending,
+            wip_pattern=wip_pattern,
+        )
+        return {"local": local, "remote": remote, "wip": wip}
 
-    Types:
-        local     Local branches
-        remote    Remote branches
-        wip       WIP/temporary branches
+    from concurrent.futures import ThreadPoolExecutor  # Only this mode needs threads
 
-    Options:
-        --json            Output JSON instead of bash declarations
-        --pattern PATTERN Ref pattern for WIP branches (default: refs/heads/WIP/)
-        --ascending       Sort ascending (oldest first, recent at bottom)
-        --sort-context    Sort context: gum-single (ascending), gum-multi (descending),
-                         static (ascending, default)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        wip = executor.submit(
+            get_wip_branch_details,
+            include_subjects=True,
+            ref_pattern=wip_pattern,
+            sort_ascending=sort_ascending,
+        )
+        local, remote = get_all_branch_details(
+            include_subjects=True, exclude_backup=True, sort_ascending=sort_ascending
+        )
+        return {"local": local, "remote": remote, "wip": wip.result()}
 
-    Outputs bash variable declarations by default, JSON with --json flag.
-    Returns exit code 1 if no branches found or on error.
 
-    Sort context determines the sort order based on usage:
-    - gum-single: Ascending (oldest first) for single-select menus with --reverse flag
-    - gum-multi: Descending (newest first) for multi-select menus without --reverse flag
-    - static: Ascending (oldest first) for static output (default)
+def _modes_to_json(modes: dict[str, BranchDetails | None]) -> str:
+    """Serialize {mode: details} as one JSON object, with null for empty modes."""
+    parts = [f"{json.dumps(mode)}:{d.to_json() if d else 'null'}" for mode, d in modes.items()]
+    return "{" + ",".join(parts) + "}"
+
+
+_CLI_TYPES = ("local", "remote", "wip", "all")
+_SORT_CONTEXTS = ("gum-single", "gum-multi", "static")
+
+
+def _parse_args_fast(argv: list[str]) -> SimpleNamespace | None:
+    """Parse the argument shapes the bash wrappers use, without argparse.
+
+    Importing argparse and building the parser costs several milliseconds
+    per call, which shows up in interactive menus. Anything unusual (help,
+    abbreviations, bad values, extra positionals) returns None so that
+    _parse_args handles it with argparse's exact behavior and messages.
     """
+    opts = {
+        "type": None,
+        "json": False,
+        "pattern": "refs/heads/WIP/",
+        "ascending": False,
+        "sort_context": None,
+    }
+    args = iter(argv)
+    for arg in args:
+        if arg == "--json":
+            opts["json"] = True
+        elif arg == "--ascending":
+            opts["ascending"] = True
+        elif arg.startswith(("--pattern", "--sort-context")):
+            name, eq, value = arg.partition("=")
+            if name not in ("--pattern", "--sort-context"):
+                return None
+            if not eq:
+                value = next(args, None)
+                if value is None or value.startswith("-"):
+                    return None
+            if name == "--sort-context" and value not in _SORT_CONTEXTS:
+                return None
+            opts[name[2:].replace("-", "_")] = value
+        elif arg.startswith("-") or opts["type"] is not None:
+            return None
+        else:
+            opts["type"] = arg
+
+    if opts["type"] not in _CLI_TYPES or (opts["type"] == "all" and not opts["json"]):
+        return None
+    return SimpleNamespace(**opts)
+
+
+def _parse_args(argv: list[str]):
+    """Parse CLI arguments with argparse (help, errors and unusual forms)."""
     import argparse
 
     parser = argparse.ArgumentParser(description="Get git branch information for Hug SCM")
-    parser.add_argument("type", choices=["local", "remote", "wip"], help="Branch type to query")
+    parser.add_argument("type", choices=_CLI_TYPES, help="Branch type to query")
     parser.add_argument(
         "--json", action="store_true", help="Output JSON instead of bash declarations"
     )
@@ -576,12 +941,46 @@ def main():
     )
     parser.add_argument(
         "--sort-context",
-        choices=["gum-single", "gum-multi", "static"],
+        choices=_SORT_CONTEXTS,
         default=None,
         help=("Sort context: gum-single (ascending), gum-multi (descending), static (ascending)"),
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.type == "all" and not args.json:
+        parser.error("type 'all' requires --json")
+    return args
+
+
+# CLI entry point for direct invocation from bash
+def main():
+    """CLI entry point for bash wrapper calls.
+
+    Usage:
+        python3 -m hug_git_branch <type> [options]
+
+    Types:
+        local     Local branches
+        remote    Remote branches
+        wip       WIP/temporary branches
+        all       All three as one JSON object (requires --json)
+
+    Options:
+        --json            Output JSON instead of bash declarations
+        --pattern PATTERN Ref pattern for WIP branches (default: refs/heads/WIP/)
+        --ascending       Sort ascending (oldest first, recent at bottom)
+        --sort-context    Sort context: gum-single (ascending), gum-multi (descending),
+                         static (ascending, default)
+
+    Outputs bash variable declarations by default, JSON with --json flag.
+    Returns exit code 1 if no branches found or on error.
+
+    Sort context determines the sort order based on usage:
+    - gum-single: Ascending (oldest first) for single-select menus with --reverse flag
+    - gum-multi: Descending (newest first) for multi-select menus without --reverse flag
+    - static: Ascending (oldest first) for static output (default)
+    """
+    args = _parse_args_fast(sys.argv[1:]) or _parse_args(sys.argv[1:])
 
     # Determine sort order based on context
     # gum-single: ascending (oldest first) - cursor at bottom with --reverse
@@ -598,6 +997,13 @@ def main():
         sort_ascending = False
 
     try:
+        if args.type == "all":
+            modes = _get_all_modes(wip_pattern=args.pattern, sort_ascending=sort_ascending)
+            if not any(d and d.branches for d in modes.values()):
+                sys.exit(1)
+            print(_modes_to_json(modes))
+            return
+
         # Get branch details based on type
         if args.type == "local":
             details = get_local_branch_details(
@@ -6,35 +6,100 @@ This module provides Python-based JSON transformation helpers for complex
 operations that are difficult or inefficient in pure Bash.
 
 Usage:
-    python3 json_transform.py transform_git_log <log_output>
-    python3 json_transform.py transform_git_status <status_output>
+    git log -z --format=%H%x1f%h%x1f%an%x1f%ae%x1f%ad%x1f%s | \
+        python3 json_transform.py transform_git_log
+    git status --porcelain=v1 -z | python3 json_transform.py transform_git_status
     python3 json_transform.py commit_search <search_type> <search_term> [--with-files]
 """
 
+import io
 import json
 import os
 import subprocess
 import sys
+from collections.abc import Callable, Iterator
 from datetime import datetime
-from typing import Any
+from typing import Any, TextIO
 
+# Output is indent-2 UTF-8 JSON: orjson when installed, else _json_dumps_stdlib.
 
-def transform_git_log_to_json(log_output: str, with_files: bool = False) -> str:
+
+def _json_dumps_stdlib(obj: Any, item_separator: str = ",") -> str:
+    """Fallback serializer producing the same text as the orjson path."""
+    return json.dumps(obj, ensure_ascii=False, indent=2, separators=(item_separator, ": "))
+
+
+try:
+    import orjson
+
+    def _json_dumps(obj: Any, item_separator: str = ",") -> str:
+        text = orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        # orjson always separates items with ","; indented, every "," ends a line
+        if item_separator != ",":
+            text = text.replace(",\n", item_separator + "\n")
+        return text
+
+    _json_loads = orjson.loads
+except ImportError:
+    _json_dumps = _json_dumps_stdlib
+    _json_loads = json.loads
+
+
+# transform_git_log input framing: single-byte separators, as produced by
+# git log -z --format=%H%x1f%h%x1f%an%x1f%ae%x1f%ad%x1f%s
+LOG_FIELD_SEPARATOR = "\x1f"
+LOG_RECORD_SEPARATOR = "\0"
+
+
+def transform_git_log_to_json(log_output: bytes | str, with_files: bool = False) -> str:
     """
     Transform git log output to JSON with proper types.
 
     Args:
-        log_output: Git log output with NUL-separated commits
+        log_output: Git log output with NUL-separated commits and fields
+            separated by LOG_FIELD_SEPARATOR. Raw bytes are decoded once as
+            UTF-8 before splitting.
         with_files: Whether to include file information
 
     Returns:
         JSON string with properly typed commit data
     """
-    commits = []
-    for line in log_output.strip().split("\0"):
+    buffer = io.StringIO()
+    stream_git_log_to_json(log_output, buffer, with_files)
+    return buffer.getvalue()
+
+
+def stream_git_log_to_json(log_output: bytes | str, out: TextIO, with_files: bool = False) -> None:
+    """
+    Write the JSON array produced by transform_git_log_to_json to out.
+
+    Each commit is serialized and written as soon as it is parsed, so the
+    list of commits is never held in memory. The output is identical to
+    transform_git_log_to_json.
+
+    Args:
+        log_output: Git log output, as for transform_git_log_to_json
+        out: Text stream to write to (e.g., sys.stdout)
+        with_files: Whether to include file information
+    """
+    separator = "["
+    for commit in _iter_git_log_commits(log_output, with_files):
+        text = _json_dumps(commit, ", ")
+        # Nest one level deeper, as json.dumps(list, indent=2) would
+        out.write(separator + "\n  " + text.replace("\n", "\n  "))
+        separator = ", "
+    out.write("[]" if separator == "[" else "\n]")
+
+
+def _iter_git_log_commits(log_output: bytes | str, with_files: bool) -> Iterator[dict[str, Any]]:
+    """Yield one commit dict per record of git log output."""
+    if isinstance(log_output, bytes):
+        log_output = log_output.decode("utf-8", errors="replace")
+
+    for line in log_output.strip().split(LOG_RECORD_SEPARATOR):
         if not line:
             continue
-        fields = line.split("---HUG-FIELD-SEPARATOR---")
+        fields = line.split(LOG_FIELD_SEPARATOR)
         if len(fields) < 6:
             continue
 
@@ -47,35 +112,41 @@ def transform_git_log_to_json(log_output: str, with_files: bool = False) -> str:
         }
 
         if with_files and len(fields) > 6:
-            commit["files"] = json.loads(fields[6]) if fields[6] else []
+            commit["files"] = _json_loads(fields[6]) if fields[6] else []
 
-        commits.append(commit)
+        yield commit
 
-    return json.dumps(commits, ensure_ascii=False, indent=2, separators=(", ", ": "))
 
-
-def transform_git_status_to_json(status_output: str) -> dict[str, Any]:
+def transform_git_status_to_json(status_output: bytes | str) -> dict[str, Any]:
     """
     Transform git status output to JSON with proper types.
 
     Args:
-        status_output: Git status output (short format)
+        status_output: Git status output, either short format (one entry per
+            line) or `git status --porcelain=v1 -z` output (NUL-terminated
+            entries). Raw bytes are decoded once as UTF-8.
 
     Returns:
         Dictionary with properly typed status data
     """
+    if isinstance(status_output, bytes):
+        status_output = status_output.decode("utf-8", errors="replace")
+
     staged = []
     unstaged = []
     untracked = []
 
-    # Don't strip individual lines - git status format requires exact character positions
-    for line in status_output.split("\n"):
-        if not line:
-            continue
-
-        status_code = line[:2]
-        file_path = line[3:] if len(line) > 3 else ""
-
+    if "\0" in status_output:
+        entries = _iter_status_z(status_output)
+    else:
+        # Don't strip individual lines - git status format requires exact character positions
+        entries = (
+            (line[:2], line[3:] if len(line) > 3 else "")
+            for line in status_output.split("\n")
+            if line
+        )
+
+    for status_code, file_path in entries:
         # Staged changes (first character)
         if status_code[0] not in (" ", "?", "!"):
             staged.append({"path": file_path, "status": _status_to_type(status_code[0])})
@@ -101,18 +172,80 @@ def transform_git_status_to_json(status_output: str) -> dict[str, Any]:
     }
 
 
+def _iter_status_z(status_output: str) -> Iterator[tuple[str, str]]:
+    """Yield (status_code, path) from `git status --porcelain=v1 -z` output."""
+    fields = iter(status_output.split("\0"))
+    for entry in fields:
+        if not entry:
+            continue
+        status_code = entry[:2]
+        # Renames and copies are followed by the original path as its own field
+        if "R" in status_code or "C" in status_code:
+            next(fields, None)
+        yield status_code, entry[3:]
+
+
+_STATUS_TYPES = {
+    "M": "modified",
+    "A": "added",
+    "D": "deleted",
+    "R": "renamed",
+    "C": "copied",
+    "U": "conflict",
+    "T": "type_changed",
+}
+
+# Status letter -> type, indexed by ord(); built once so each lookup is a
+# tuple index instead of a per-call dict build and hash.
+_STATUS_TABLE = tuple(_STATUS_TYPES.get(chr(i), "unknown") for i in range(256))
+
+
 def _status_to_type(code: str) -> str:
     """Convert git status code to human-readable type."""
-    mapping = {
-        "M": "modified",
-        "A": "added",
-        "D": "deleted",
-        "R": "renamed",
-        "C": "copied",
-        "U": "conflict",
-        "T": "type_changed",
-    }
-    return mapping.get(code, "unknown")
+    try:
+        return _STATUS_TABLE[ord(code)]
+    except (TypeError, IndexError):  # empty, multi-char or non-Latin-1 code
+        return "unknown"
+
+
+# Top-level shape of the JSON documents hug emits, by schema name.
+_SCHEMAS: dict[str, dict[str, Any]] = {
+    "status": {"type": "object", "required": ["repository", "status"]},
+    "commit_search": {"type": "object", "required": ["repository", "search", "results"]},
+    "branch_list": {"type": "object", "required": ["repository", "branches"]},
+}
+
+
+def _compile_schema_stdlib(schema: dict[str, Any]) -> Callable[[Any], bool]:
+    """Build a validator for the object/required subset of JSON Schema used in _SCHEMAS."""
+    required = frozenset(schema.get("required", ()))
+
+    def validate(data: Any) -> bool:
+        return isinstance(data, dict) and required <= data.keys()
+
+    return validate
+
+
+try:
+    import fastjsonschema
+
+    def _compile_schema(schema: dict[str, Any]) -> Callable[[Any], bool]:
+        check = fastjsonschema.compile(schema)
+
+        def validate(data: Any) -> bool:
+            try:
+                check(data)
+            except fastjsonschema.JsonSchemaException:
+                return False
+            return True
+
+        return validate
+
+except ImportError:
+    _compile_schema = _compile_schema_stdlib
+
+# Compiled once at import; validate_json_schema only parses and calls
+_VALIDATORS = {name: _compile_schema(schema) for name, schema in _SCHEMAS.items()}
 
 
 def validate_json_schema(json_data: str, schema_name: str) -> bool:
@@ -124,25 +257,20 @@ def validate_json_schema(json_data: str, schema_name: str) -> bool:
         schema_name: Name of schema to validate against
 
     Returns:
-        True if valid, False otherwise
+        True if valid, False otherwise. Unknown schema names only require
+        well-formed JSON.
     """
     try:
-        data = json.loads(json_data)
-    except json.JSONDecodeError:
+        data = _json_loads(json_data)
+    except json.JSONDecodeError:  # orjson.JSONDecodeError subclasses it
         return False
 
-    # Basic validation for common schemas
-    if schema_name == "status":
-        required_keys = ["repository", "status"]
-        return all(key in data for key in required_keys)
-    elif schema_name == "commit_search":
-        required_keys = ["repository", "search", "results"]
-        return all(key in data for key in required_keys)
-    elif schema_name == "branch_list":
-        required_keys = ["repository", "branches"]
-        return all(key in data for key in required_keys)
+    validator = _VALIDATORS.get(schema_name)
+    return validator is None or validator(data)
 
-    return True
+
+# git log option prefix for each supported commit_search type.
+_SEARCH_TYPE_OPTIONS = {"message": "--grep=", "code": "-S"}
 
 
 def commit_search(
@@ -167,15 +295,26 @@ def commit_search(
     Returns:
         Dictionary with search results in GitHub-compatible format
     """
+    search_option = _SEARCH_TYPE_OPTIONS.get(search_type)
+    if search_option is None:
+        return {
+            "error": {
+                "type": "invalid_search_type",
+                "message": 'Search type must be "message" or "code"',
+            }
+        }
+
     # Use the same format as log_json.py for consistency
     field_sep = "|~|"
     # Format: hash|~|short|~|author_name|~|author_email|~|committer_name|~|committer_email|~|
     #         author_date|~|author_date_rel|~|committer_date|~|committer_date_rel|~|tree|~|
     #         subject|~|body|~|parents|~|refs
+    # The parser discards the body for --no-body; keep the field but don't ship the message
+    body = "" if no_body else "%B"
     format_str = (
         f"%H{field_sep}%h{field_sep}%an{field_sep}%ae{field_sep}%cn{field_sep}%ce"
         f"{field_sep}%aI{field_sep}%ar{field_sep}%cI{field_sep}%cr{field_sep}%T"
-        f"{field_sep}%s{field_sep}%B{field_sep}%P{field_sep}%D"
+        f"{field_sep}%s{field_sep}{body}{field_sep}%P{field_sep}%D"
     )
 
     # Build git log command
@@ -184,17 +323,7 @@ def commit_search(
     if with_files:
         cmd.append("--name-status")
 
-    if search_type == "message":
-        cmd.append(f"--grep={search_term}")
-    elif search_type == "code":
-        cmd.append(f"-S{search_term}")
-    else:
-        return {
-            "error": {
-                "type": "invalid_search_type",
-                "message": 'Search type must be "message" or "code"',
-            }
-        }
+    cmd.append(f"{search_option}{search_term}")
 
     if additional_args:
         cmd.extend(additional_args)
@@ -269,13 +398,13 @@ def main():
     command = sys.argv[1]
 
     if command == "transform_git_log":
-        log_data = sys.stdin.read()
+        log_data = sys.stdin.buffer.read()
         with_files = "--with-files" in sys.argv
-        result = transform_git_log_to_json(log_data, with_files)
-        print(result)
+        stream_git_log_to_json(log_data, sys.stdout, with_files)
+        print()
     elif command == "transform_git_status":
-        status_data = sys.stdin.read()
-        result = json.dumps(transform_git_status_to_json(status_data), indent=2)
+        status_data = sys.stdin.buffer.read()
+        result = _json_dumps(transform_git_status_to_json(status_data))
         print(result)
     elif command == "commit_search":
         if len(sys.argv) < 4:
@@ -291,7 +420,7 @@ def main():
         no_body = "--no-body" in sys.argv
         additional_args = [arg for arg in sys.argv[4:] if arg not in ("--with-files", "--no-body")]
         result = commit_search(search_type, search_term, with_files, no_body, additional_args)
-        print(json.dumps(result, ensure_ascii=False, indent=2, separators=(", ", ": ")))
+        print(_json_dumps(result, ", "))
     elif command == "validate":
         if len(sys.argv) < 3:
             print("Usage: json_transform.py validate <schema_name>", file=sys.stderr)
@@ -3,7 +3,7 @@
 Parse git log output with numstat and format as JSON.
 
 Usage:
-    git log --format='<format>' --numstat | python3 log_json.py [--with-stats]
+    git log --format='<format>' --numstat | python3 log_json.py [--with-stats] [--ndjson]
 
 Input format expected:
     The format string splits across multiple lines:
@@ -19,6 +19,42 @@ import json
 import re
 import sys
 
+# Commits go out as compact UTF-8 JSON, one dumps() call per commit when streaming.
+
+
+def _json_dumps_stdlib(obj):
+    """Fallback serializer producing the same text as the orjson path."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        try:
+            return orjson.dumps(obj).decode()
+        except orjson.JSONEncodeError:
+            # Lone surrogates (undecodable input read with surrogateescape)
+            return _json_dumps_stdlib(obj)
+
+except ImportError:
+    _json_dumps = _json_dumps_stdlib
+
+# A commit header line starts with the full 40-char hash and the first separator.
+# Compiled once: re.match() would look the pattern up in re's cache on every line.
+_COMMIT_START_RE = re.compile(r"[0-9a-f]{40}\|~\|")
+
+# Map git name-status chars to GitHub-style status
+_NAME_STATUS_MAP = {
+    "A": "added",
+    "M": "modified",
+    "D": "deleted",
+    "R": "renamed",
+    "C": "copied",
+    "T": "type_changed",
+    "U": "unmerged",
+}
+
 
 def parse_log_with_stats(lines, include_stats=True, omit_body=False):
     """Parse git log output with --numstat
@@ -28,6 +64,22 @@ def parse_log_with_stats(lines, include_stats=True, omit_body=False):
         include_stats: Whether to include stats field in output (default: True)
         omit_body: Whether to omit body text from output (default: False)
 
+    Returns the list of commits produced by iter_commits().
+    """
+    return list(iter_commits(lines, include_stats, omit_body))
+
+
+def iter_commits(lines, include_stats=True, omit_body=False):
+    """Yield commits from git log output with --numstat, one at a time
+
+    Args:
+        lines: Lines from git log output (any iterable, consumed lazily)
+        include_stats: Whether to include stats field in output (default: True)
+        omit_body: Whether to omit body text from output (default: False)
+
+    Only the commit being assembled is held in memory, so callers can write
+    each commit out before the rest of the log has been read.
+
     The git log format we use is:
     %H|~|%h|~|%an|~|%ae|~|%cn|~|%ce|~|%aI|~|%ar|~|%s|~|%B|~|%P|~|%D
 
@@ -39,10 +91,11 @@ def parse_log_with_stats(lines, include_stats=True, omit_body=False):
 
     Strategy: Accumulate lines until we find the next commit hash
     """
-    commits = []
     current_lines = []
     current_numstats = []
     in_numstat = False
+    # Bound once: a global plus attribute lookup per line adds up on long logs
+    is_commit_start = _COMMIT_START_RE.match
 
     for line in lines:
         line = line.rstrip("\n")
@@ -50,14 +103,14 @@ def parse_log_with_stats(lines, include_stats=True, omit_body=False):
         # Always check for new commit first - this prevents subsequent commit lines
         # from being absorbed into previous commit's body.
         # Accept only 40 char hashes (git commit SHAs are always 40 hexadecimal characters)
-        if re.match(r"^[0-9a-f]{40}\|~\|", line):
+        if is_commit_start(line):
             # Process previous commit if exists
             if current_lines:
                 commit = parse_single_commit(
                     current_lines, current_numstats, include_stats, omit_body
                 )
                 if commit:
-                    commits.append(commit)
+                    yield commit
             # Validate that commit line has enough fields before starting new commit
             # Expected format has 15 fields separated by |~|, but body (%B) spans multiple lines
             # so the first line might have 13 fields (up to and including start of body)
@@ -78,13 +131,10 @@ def parse_log_with_stats(lines, include_stats=True, omit_body=False):
         # numstat: N\tM\tfilename (e.g., "10\t5\tsrc/file.py")
         # name-status: X\tfilename (e.g., "A\tsrc/file.py", "M\tsrc/file.py")
         if "\t" in line and "|~|" not in line:
-            parts = line.split("\t")
-            # numstat has 3+ parts, name-status has 2+ parts
-            if len(parts) >= 2:
-                # This is a numstat or name-status line
-                current_numstats.append(line)
-                in_numstat = True
-                continue
+            # A tab means numstat (3+ parts) or name-status (2+ parts)
+            current_numstats.append(line)
+            in_numstat = True
+            continue
 
         # If we're not in numstat and not blank, it's part of commit body
         # Skip blank lines that appear between commits (when in_numstat=True)
@@ -95,9 +145,7 @@ def parse_log_with_stats(lines, include_stats=True, omit_body=False):
     if current_lines:
         commit = parse_single_commit(current_lines, current_numstats, include_stats, omit_body)
         if commit:
-            commits.append(commit)
-
-    return commits
+            yield commit
 
 
 def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body=False):
@@ -119,7 +167,8 @@ def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body
     if not lines:
         return None
 
-    if numstat_lines is None:
+    if numstat_lines is None or not include_stats:
+        # File lines only feed "stats" and "files"; skip parsing them when those are omitted
         numstat_lines = []
 
     # First line has: hash|~|short|~|...|~|subject|~|<body starts>
@@ -142,17 +191,20 @@ def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body
 
     hash_val = fields[0]
     hash_short = fields[1]
-    author_name = fields[2]
-    author_email = fields[3]
-    committer_name = fields[4]
-    committer_email = fields[5]
+    # A handful of people author most commits; share one copy of each identity
+    author_name = sys.intern(fields[2])
+    author_email = sys.intern(fields[3])
+    committer_name = sys.intern(fields[4])
+    committer_email = sys.intern(fields[5])
     author_date = fields[6]
     author_date_relative = fields[7]
     committer_date = fields[8]
     committer_date_relative = fields[9]
     tree_sha = fields[10]
     subject = fields[11]
-    fields[12]  # This is the start of %B (which includes subject line again)
+    # fields[12] is the start of %B (which includes subject line again); it
+    # runs to the end of first_line, so the body begins len(fields[12]) from there
+    body_start = len(first_line) - len(fields[12])
 
     # Now we need to extract the body, parents, and refs from the full text
     # The last line should end with: |~|parent_hashes|~|refs
@@ -174,16 +226,16 @@ def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body
 
     parents_str = remaining[second_last_sep + 3 :].strip()
 
-    # Everything before that is the body
-    body_end_pos = second_last_sep
-
-    # Body starts after field 12 in first line
-    first_line_prefix = "|~|".join(fields[:12]) + "|~|"
-    body_full = full_text[len(first_line_prefix) : body_end_pos]
+    if omit_body:
+        # The body is discarded, so skip slicing and splitting the message
+        body = None
+    else:
+        # Everything between field 12 and the trailer is the body
+        body_full = full_text[body_start:second_last_sep]
 
-    # Extract subject and body from full body text
-    body_parts = body_full.strip().split("\n", 1)
-    body = body_parts[1].strip() if len(body_parts) > 1 else ""
+        # Extract subject and body from full body text
+        body_parts = body_full.strip().split("\n", 1)
+        body = body_parts[1].strip() if len(body_parts) > 1 else ""
 
     # Parse refs
     refs = []
@@ -206,21 +258,25 @@ def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body
         for parent_sha in parents_str.split():
             parents.append({"sha": parent_sha})
 
-    # Parse numstat or name-status lines
-    stats = {"files_changed": 0, "insertions": 0, "deletions": 0}
+    # Parse numstat or name-status lines; totals stay in locals until the end
+    files_changed = insertions = deletions = 0
     files = []  # Detailed file changes for GitHub compatibility
 
     for line in numstat_lines:
-        parts = line.split("\t")
-        if len(parts) >= 3:
+        # partition() scans once and returns a fixed 3-tuple, with no list to build
+        first, sep, rest = line.partition("\t")
+        if not sep:
+            continue
+        second, sep, rest = rest.partition("\t")
+        if sep:
             # numstat format: N\tM\tfilename
             try:
-                add = 0 if parts[0] == "-" else int(parts[0])
-                delete = 0 if parts[1] == "-" else int(parts[1])
-                filename = parts[2]
-                stats["insertions"] += add
-                stats["deletions"] += delete
-                stats["files_changed"] += 1
+                add = 0 if first == "-" else int(first)
+                delete = 0 if second == "-" else int(second)
+                filename = sys.intern(rest.partition("\t")[0])
+                insertions += add
+                deletions += delete
+                files_changed += 1
 
                 # Add file details to files array
                 files.append(
@@ -235,22 +291,12 @@ def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body
             except ValueError:
                 # Not a valid numstat line
                 pass
-        elif len(parts) == 2:
+        else:
             # name-status format: X\tfilename (e.g., "A\tsrc/file.py")
-            status_char = parts[0].strip()
-            filename = parts[1].strip()
-
-            # Map git status chars to GitHub-style status
-            status_map = {
-                "A": "added",
-                "M": "modified",
-                "D": "deleted",
-                "R": "renamed",
-                "C": "copied",
-                "T": "type_changed",
-                "U": "unmerged",
-            }
-            status = status_map.get(status_char, "modified")
+            status_char = first.strip()
+            filename = sys.intern(second.strip())
+
+            status = _NAME_STATUS_MAP.get(status_char, "modified")
 
             files.append(
                 {
@@ -261,11 +307,9 @@ def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body
                     "changes": 0,
                 }
             )
-            stats["files_changed"] += 1
+            files_changed += 1
 
-    # Apply omit_body flag if requested
-    if omit_body:
-        body = None
+    stats = {"files_changed": files_changed, "insertions": insertions, "deletions": deletions}
 
     # Construct full message (GitHub compat)
     full_message = subject
@@ -304,6 +348,41 @@ def parse_single_commit(lines, numstat_lines=None, include_stats=True, omit_body
     return commit
 
 
+def write_log_json(commits, out):
+    """Write the `hug ll` JSON object for commits to out, one commit at a time
+
+    The text matches compact json.dumps() of {"command", "commits",
+    "summary"}, but the commit list is never materialized.
+    """
+    out.write('{"command":"hug ll","commits":[')
+    total = 0
+    earliest = latest = None
+    for commit in commits:
+        if total:
+            out.write(",")
+        out.write(_json_dumps(commit))
+        total += 1
+        date = commit["author"]["date"]
+        if earliest is None or date < earliest:
+            earliest = date
+        if latest is None or date > latest:
+            latest = date
+
+    summary = {"total_commits": total}
+    if total:
+        summary["date_range"] = {"earliest": earliest, "latest": latest}
+    out.write('],"summary":')
+    out.write(_json_dumps(summary))
+    out.write("}\n")
+
+
+def stream_log_ndjson(commits, out):
+    """Write each commit as one line of compact JSON (NDJSON) to out"""
+    for commit in commits:
+        out.write(_json_dumps(commit))
+        out.write("\n")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Format git log output as JSON")
     parser.add_argument(
@@ -312,25 +391,22 @@ def main():
     parser.add_argument(
         "--no-body", action="store_true", help="Omit commit message body (subject only)"
     )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream one compact JSON commit per line instead of a single object",
+    )
     args = parser.parse_args()
 
-    # Read all input
-    lines = sys.stdin.readlines()
-
-    # Parse commits with conditional stats and body
-    commits = parse_log_with_stats(lines, include_stats=args.with_stats, omit_body=args.no_body)
-
-    # Build output
-    output = {"command": "hug ll", "commits": commits, "summary": {"total_commits": len(commits)}}
-
-    if commits:
-        earliest = min(c["author"]["date"] for c in commits)
-        latest = max(c["author"]["date"] for c in commits)
-        output["summary"]["date_range"] = {"earliest": earliest, "latest": latest}
+    # Parse commits with conditional stats and body straight off stdin, so each
+    # commit is written once the next header arrives instead of after all input
+    commits = iter_commits(sys.stdin, include_stats=args.with_stats, omit_body=args.no_body)
 
-    # Output compact JSON (spaces after : and , for readability but no newlines)
-    # Use separators with spaces to match bash JSON output format
-    print(json.dumps(output, separators=(", ", ": ")))
+    if args.ndjson:
+        stream_log_ndjson(commits, sys.stdout)
+    else:
+        # Output compact JSON; the bash callers re-serialize it with jq
+        write_log_json(commits, sys.stdout)
 
 
 if __name__ == "__main__":
@@ -20,11 +20,14 @@ Example:
 import argparse
 import json
 import math
+import re
 import subprocess
 import sys
-from collections import defaultdict
+from collections import Counter
 from datetime import datetime
 
+_COMMIT_HASH_RE = re.compile(r"[0-9a-fA-F]{40}")
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -67,9 +70,11 @@ def get_file_commit_history(filepath: str, since: str = None) -> list[dict]:
                 continue
 
             hash_val, author, date_str = line.split("|", 2)
+            # Authors repeat across the history; every commit shares one name object
+            author = sys.intern(author)
 
-            # Parse date
-            commit_date = datetime.fromisoformat(date_str.replace(" ", "T", 1).rsplit(" ", 1)[0])
+            # %ai is fixed-width "YYYY-MM-DD HH:MM:SS +ZZZZ"; parse the local wall time
+            commit_date = datetime.fromisoformat(date_str[:19])
             days_ago = (now - commit_date).days
 
             commits.append(
@@ -97,39 +102,21 @@ def get_author_files(author: str, since: str = None) -> dict[str, int]:
     try:
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
 
-        file_commits = defaultdict(int)
-
-        lines = result.stdout.strip().split("\n")
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-
-            # Check if this is a commit hash
-            if len(line) == 40 and all(c in "0123456789abcdef" for c in line.lower()):
-                # Process all non-empty lines after hash until next hash or end
-                i += 1
-                while i < len(lines):
-                    file_line = lines[i].strip()
-
-                    if not file_line:
-                        # Skip empty lines
-                        i += 1
-                        continue
-
-                    # Check if we hit next commit hash
-                    if len(file_line) == 40 and all(
-                        c in "0123456789abcdef" for c in file_line.lower()
-                    ):
-                        # Don't increment i, we'll process this hash in outer loop
-                        break
-
-                    # This is a file path
-                    file_commits[file_line] += 1
-                    i += 1
-            else:
-                i += 1
+        # Each commit is its hash line followed by the paths it touched; lines
+        # before the first hash are not part of any commit
+        paths = []
+        in_commit = False
+        for line in result.stdout.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            if len(line) == 40 and _COMMIT_HASH_RE.fullmatch(line):
+                in_commit = True
+            elif in_commit:
+                paths.append(line)
 
-        return dict(file_commits)
+        # Counter tallies the whole list in C
+        return Counter(paths)
 
     except subprocess.CalledProcessError as e:
         print(f"Error getting author files: {e}", file=sys.stderr)
@@ -154,30 +141,35 @@ def calculate_file_ownership(commits: list[dict], decay_days: int) -> list[dict]
 
     Returns: List of {author, raw_commits, weighted_score, ownership_pct, classification}
     """
-    author_data = defaultdict(
-        lambda: {"raw_commits": 0, "weighted_score": 0.0, "last_commit_days": float("inf")}
-    )
+    # author -> [raw_commits, weighted_score, last_commit_days]; one lookup per commit
+    author_data = {}
+    exp = math.exp
 
     for commit in commits:
         author = commit["author"]
         days_ago = commit["days_ago"]
+        # Same formula as calculate_recency_weight, inlined for the per-commit loop
+        weight = exp(-days_ago / decay_days)
 
-        author_data[author]["raw_commits"] += 1
-        author_data[author]["weighted_score"] += calculate_recency_weight(days_ago, decay_days)
-        author_data[author]["last_commit_days"] = min(
-            author_data[author]["last_commit_days"], days_ago
-        )
+        data = author_data.get(author)
+        if data is None:
+            author_data[author] = [1, weight, days_ago]
+        else:
+            data[0] += 1
+            data[1] += weight
+            if days_ago < data[2]:
+                data[2] = days_ago
 
     # Calculate total weighted score
-    total_weighted = sum(data["weighted_score"] for data in author_data.values())
+    total_weighted = sum(data[1] for data in author_data.values())
 
     if total_weighted == 0:
         return []
 
     # Build ownership list
     ownership = []
-    for author, data in author_data.items():
-        ownership_pct = (data["weighted_score"] / total_weighted) * 100
+    for author, (raw_commits, weighted_score, last_commit_days) in author_data.items():
+        ownership_pct = (weighted_score / total_weighted) * 100
 
         # Classify ownership level
         if ownership_pct >= 40:
@@ -190,11 +182,11 @@ def calculate_file_ownership(commits: list[dict], decay_days: int) -> list[dict]
         ownership.append(
             {
                 "author": author,
-                "raw_commits": data["raw_commits"],
-                "weighted_score": data["weighted_score"],
+                "raw_commits": raw_commits,
+                "weighted_score": weighted_score,
                 "ownership_pct": ownership_pct,
                 "classification": classification,
-                "last_commit_days": data["last_commit_days"],
+                "last_commit_days": last_commit_days,
             }
         )
 
@@ -22,6 +22,15 @@ import hug_git_branch
 ################################################################################
 
 
+@pytest.fixture(autouse=True)
+def clear_git_cache(monkeypatch):
+    """Keep memoized git output and helper processes from leaking between tests."""
+    monkeypatch.setattr(hug_git_branch, "_ref_resolver", hug_git_branch._GitRefResolver())
+    hug_git_branch._run_git_cached.cache_clear()
+    yield
+    hug_git_branch._run_git_cached.cache_clear()
+
+
 @pytest.fixture
 def sample_branch_details():
     """Sample BranchDetails for testing."""
@@ -111,6 +120,13 @@ class TestBranchInfo:
         assert branch.track == ""
         assert branch.remote_ref == ""
 
+    def test_branch_info_is_slotted(self):
+        """Should not carry a per-instance __dict__ (one is built per branch)."""
+        branch = hug_git_branch.BranchInfo(name="main", hash="abc123")
+        assert not hasattr(branch, "__dict__")
+        with pytest.raises(AttributeError):
+            branch.unknown_field = "x"
+
 
 ################################################################################
 # TestBranchDetails (dataclass + serialization tests)
@@ -157,6 +173,27 @@ class TestBranchDetails:
         assert "track" in branch
         assert "remote_ref" in branch
 
+    def test_to_json_stdlib_fallback_matches_fast_path(self):
+        """Stdlib fallback should emit the same text as the active serializer."""
+        details = hug_git_branch.BranchDetails(
+            current_branch="café",
+            max_len=4,
+            branches=[
+                hug_git_branch.BranchInfo(
+                    name="café", hash="abc123", subject='Fix "quotes" 😀', track=""
+                )
+            ],
+        )
+
+        fallback = hug_git_branch._json_dumps_stdlib(details)
+
+        assert details.to_json() == fallback
+        assert fallback == (
+            '{"current_branch":"café","max_len":4,"branches":[{"name":"café",'
+            '"hash":"abc123","date":"","subject":"Fix \\"quotes\\" 😀","track":"",'
+            '"remote_ref":""}]}'
+        )
+
     def test_to_bash_declare_outputs_valid_declarations(self, sample_branch_details):
         """Should output bash declare statements."""
         bash_output = sample_branch_details.to_bash_declare()
@@ -226,6 +263,21 @@ class TestBranchDetails:
 
         assert "declare -a remote_refs=" not in bash_output
 
+    def test_to_bash_declare_exact_output(self, sample_remote_branch_details):
+        """Should emit one declare line per variable, in a stable order."""
+        bash_output = sample_remote_branch_details.to_bash_declare()
+
+        assert bash_output.split("\n") == [
+            "declare current_branch=''",
+            "declare max_len=8",
+            "declare -a branches=('main' 'feature')",
+            "declare -a hashes=('abc123' 'def456')",
+            "declare -a dates=('' '')",
+            "declare -a tracks=('' '')",
+            "declare -a subjects=('Main branch' 'Feature branch')",
+            "declare -a remote_refs=('origin/main' 'upstream/feature')",
+        ]
+
     def test_to_bash_declare_empty_arrays(self):
         """Should handle empty branch list."""
         details = hug_git_branch.BranchDetails(current_branch="", max_len=0, branches=[])
@@ -274,6 +326,11 @@ class TestBashEscape:
         assert "'\\''" in result
         assert "\\\\" in result
 
+    def test_escapes_mixed_input_exactly(self):
+        """Should produce the exact quoted form for mixed quotes and backslashes."""
+        result = hug_git_branch._bash_escape("a\\'b'\\")
+        assert result == "'a\\\\'\\''b'\\''\\\\'"
+
     def test_handles_double_quotes(self):
         """Should handle double quotes (no special escaping needed in single quotes)."""
         result = hug_git_branch._bash_escape('test with "quotes"')
@@ -346,6 +403,14 @@ class TestSanitizeString:
         assert hug_git_branch._sanitize_string("test\r\n") == "test"
         assert hug_git_branch._sanitize_string("test\r") == "test"
 
+    def test_removes_vertical_tab_and_form_feed(self):
+        """Should strip every ASCII whitespace character in one call."""
+        assert hug_git_branch._sanitize_string("\x0b\x0c\r test \r\x0c\x0b") == "test"
+
+    def test_preserves_internal_carriage_returns(self):
+        """Should only strip the ends, leaving interior characters intact."""
+        assert hug_git_branch._sanitize_string("\rtest\rvalue\r") == "test\rvalue"
+
     def test_preserves_internal_whitespace(self):
         """Should preserve internal whitespace."""
         assert hug_git_branch._sanitize_string("test value") == "test value"
@@ -373,41 +438,58 @@ class TestRunGit:
         """Should run git command and return stdout."""
         with patch("hug_git_branch.subprocess.run") as mock_run:
             mock_result = MagicMock()
-            mock_result.stdout = "output\n"
+            mock_result.stdout = b"output\n"
             mock_run.return_value = mock_result
 
             result = hug_git_branch._run_git(["status"])
 
             assert result == "output"
             mock_run.assert_called_once_with(
-                ["git", "status"], capture_output=True, text=True, check=True
+                ["git", "-c", "core.commitGraph=true", "status"],
+                capture_output=True,
+                check=True,
             )
 
     def test_runs_git_command_with_check_false(self):
         """Should run git command without checking exit code."""
         with patch("hug_git_branch.subprocess.run") as mock_run:
             mock_result = MagicMock()
-            mock_result.stdout = "output\n"
+            mock_result.stdout = b"output\n"
             mock_run.return_value = mock_result
 
             result = hug_git_branch._run_git(["status"], check=False)
 
             assert result == "output"
             mock_run.assert_called_once_with(
-                ["git", "status"], capture_output=True, text=True, check=False
+                ["git", "-c", "core.commitGraph=true", "status"],
+                capture_output=True,
+                check=False,
             )
 
     def test_strips_trailing_newlines(self):
         """Should strip trailing newlines and carriage returns."""
         with patch("hug_git_branch.subprocess.run") as mock_run:
             mock_result = MagicMock()
-            mock_result.stdout = "output\n\r\n"
+            mock_result.stdout = b"output\n\r\n"
             mock_run.return_value = mock_result
 
             result = hug_git_branch._run_git(["status"])
 
             assert result == "output"
 
+    def test_replaces_undecodable_output(self):
+        """Should decode as UTF-8 and replace invalid bytes rather than fail."""
+        with patch("hug_git_branch.subprocess.run") as mock_run:
+            mock_result = MagicMock()
+            mock_result.stdout = b"caf\xe9\n"
+            mock_run.return_value = mock_result
+
+            result = hug_git_branch._run_git(["log", "-1", "--format=%s"])
+
+            assert result == "caf\ufffd"
+            assert "text" not in mock_run.call_args.kwargs
+            assert "encoding" not in mock_run.call_args.kwargs
+
     def test_raises_on_non_zero_exit_when_check_true(self):
         """Should raise CalledProcessError on non-zero exit when check=True."""
         with patch("hug_git_branch.subprocess.run") as mock_run:
@@ -422,7 +504,7 @@ class TestRunGit:
             # When check=False, _run_git catches the exception internally
             # Set up a mock result that will be returned
             mock_result = MagicMock()
-            mock_result.stdout = ""
+            mock_result.stdout = b""
             mock_run.return_value = mock_result
 
             result = hug_git_branch._run_git(["status"], check=False)
@@ -430,6 +512,147 @@ class TestRunGit:
             # Should complete without raising
             assert result is not None
 
+    def test_caches_repeated_queries(self):
+        """Should spawn git once for repeated identical queries."""
+        with patch("hug_git_branch.subprocess.run") as mock_run:
+            mock_result = MagicMock()
+            mock_result.stdout = b"main\n"
+            mock_run.return_value = mock_result
+
+            first = hug_git_branch._run_git(["branch", "--show-current"], check=False)
+            second = hug_git_branch._run_git(["branch", "--show-current"], check=False)
+
+            assert first == second == "main"
+            mock_run.assert_called_once()
+
+    def test_does_not_cache_failures(self):
+        """Should retry git after a failed query instead of caching the error."""
+        with patch("hug_git_branch.subprocess.run") as mock_run:
+            mock_result = MagicMock()
+            mock_result.stdout = b"ok\n"
+            mock_run.side_effect = [CalledProcessError(1, "git"), mock_result]
+
+            with pytest.raises(CalledProcessError):
+                hug_git_branch._run_git(["status"])
+            assert hug_git_branch._run_git(["status"]) == "ok"
+
+    def test_public_queries_clear_cache(self):
+        """Should not serve git output cached by a previous public query."""
+        with patch("hug_git_branch.subprocess.run") as mock_run:
+            mock_result = MagicMock()
+            mock_result.stdout = b""
+            mock_run.return_value = mock_result
+
+            hug_git_branch.find_remote_branch("feature")
+            hug_git_branch.find_remote_branch("feature")
+
+            assert mock_run.call_count == 2
+
+
+################################################################################
+# TestRunGitForEachRef (ref listing tests)
+################################################################################
+
+
+class TestRunGitForEachRef:
+    """Tests for _run_git_for_each_ref and the streaming helpers behind it."""
+
+    @staticmethod
+    def _stream(mock_popen, *chunks):
+        """Make the mocked Popen emit stdout in the given chunks."""
+        proc = mock_popen.return_value.__enter__.return_value
+        proc.stdout.read.side_effect = [*chunks, b""]
+        return proc
+
+    def test_uses_single_git_call(self):
+        """Should fetch all refs with one for-each-ref invocation."""
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            self._stream(mock_popen, b"main\0abc123\0\nfeature\0def456\0\n")
+
+            list(
+                hug_git_branch._run_git_for_each_ref(
+                    "%(refname:short)%00%(objectname:short)%00", "refs/heads/"
+                )
+            )
+
+            mock_popen.assert_called_once()
+            assert mock_popen.call_args[0][0] == [
+                "git",
+                "-c",
+                "core.commitGraph=true",
+                "for-each-ref",
+                "--format=%(refname:short)%00%(objectname:short)%00",
+                "--sort=-committerdate",
+                "refs/heads/",
+            ]
+
+    def test_removes_record_separator_newlines(self):
+        """Should not leak git's record-terminating newline into the next field."""
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            self._stream(mock_popen, b"main\0abc123\0\0\nfeature\0def456\0origin/feature\0\n")
+
+            result = list(
+                hug_git_branch._run_git_for_each_ref("%(refname:short)%00", "refs/heads/")
+            )
+
+            assert result == ["main", "abc123", "", "feature", "def456", "origin/feature", ""]
+
+    def test_reassembles_fields_split_across_reads(self):
+        """Should join fields and record framing that straddle read boundaries."""
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            self._stream(mock_popen, b"main\0ab", b"c123\0", b"\nfeat", b"ure\0def456\0\n")
+
+            result = list(
+                hug_git_branch._run_git_for_each_ref("%(refname:short)%00", "refs/heads/")
+            )
+
+            assert result == ["main", "abc123", "feature", "def456", ""]
+
+    def test_ascending_sort(self):
+        """Should request ascending committerdate sort when asked."""
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            self._stream(mock_popen)
+
+            list(
+                hug_git_branch._run_git_for_each_ref(
+                    "%(refname)", "refs/heads/", sort_ascending=True
+                )
+            )
+
+            assert "--sort=committerdate" in mock_popen.call_args[0][0]
+
+    def test_yields_nothing_when_no_output(self):
+        """Should produce no fields when no refs match."""
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            self._stream(mock_popen)
+
+            assert list(hug_git_branch._run_git_for_each_ref("%(refname)", "refs/heads/")) == []
+
+    def test_decodes_multibyte_characters_split_across_reads(self):
+        """Should decode each field only after it is complete."""
+        subject = "Añadir ✨".encode()
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            self._stream(mock_popen, b"main\0" + subject[:4], subject[4:] + b"\0\n")
+
+            result = list(hug_git_branch._run_git_for_each_ref("%(subject)%00", "refs/heads/"))
+
+            assert result == ["main", "Añadir ✨", ""]
+
+    def test_replaces_invalid_utf8(self):
+        """Should replace undecodable bytes instead of failing the listing."""
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            self._stream(mock_popen, b"caf\xe9\0\n")
+
+            result = list(hug_git_branch._run_git_for_each_ref("%(subject)%00", "refs/heads/"))
+
+            assert result == ["caf\ufffd", ""]
+
+    def test_iter_records_drops_partial_trailing_record(self):
+        """Should group fields into fixed-size records, ignoring leftovers."""
+        records = list(hug_git_branch._iter_records(["a", "b", "c", "d", ""], 2))
+
+        assert records == [("a", "b"), ("c", "d")]
+
 
 ################################################################################
 # TestComputeDivergence (divergence calculation tests)
@@ -505,6 +728,13 @@ class TestComputeDivergence:
             assert ahead == "0"
             assert behind == "0"
 
+    def test_handles_extra_fields(self):
+        """Should reject output with more than two counts."""
+        with patch("hug_git_branch._run_git") as mock_run:
+            mock_run.return_value = "1\t2\t3"
+
+            assert hug_git_branch._compute_divergence("feature", "origin/main") == ("", "0", "0")
+
     def test_handles_git_error(self):
         """Should handle git command errors gracefully."""
         with patch("hug_git_branch._run_git") as mock_run:
@@ -517,6 +747,29 @@ class TestComputeDivergence:
             assert behind == "0"
 
 
+################################################################################
+# TestParseTrack (upstream:track parsing tests)
+################################################################################
+
+
+class TestParseTrack:
+    """Tests for _parse_track function."""
+
+    @pytest.mark.parametrize(
+        ("track", "expected"),
+        [
+            ("[ahead 3]", ("[ahead 3]", "3", "0")),
+            ("[behind 2]", ("[behind 2]", "0", "2")),
+            ("[ahead 3, behind 2]", ("[ahead 3, behind 2]", "3", "2")),
+            ("", ("", "0", "0")),
+            ("[gone]", ("", "0", "0")),
+        ],
+    )
+    def test_parses_git_track_field(self, track, expected):
+        """Should match _compute_divergence output for each track form."""
+        assert hug_git_branch._parse_track(track) == expected
+
+
 ################################################################################
 # TestGetLocalBranchDetails (main function tests with mocks)
 ################################################################################
@@ -629,6 +882,23 @@ class TestGetLocalBranchDetails:
             assert "main" in branch_names
             assert "hug-backups/test" in branch_names
 
+    def test_shares_track_strings_between_branches(self):
+        """Should intern track strings so equal tracks are one object."""
+        with (
+            patch("hug_git_branch._run_git", return_value="main"),
+            patch("hug_git_branch._run_git_for_each_ref") as mock_for_each,
+        ):
+            mock_for_each.return_value = [
+                *["main", "abc123", "2024-01-15", "One", "origin/main", "[behind 2]"],
+                *["topic", "def456", "2024-01-16", "Two", "origin/main", "[behind 2]"],
+            ]
+
+            result = hug_git_branch.get_local_branch_details()
+
+            first, second = result.branches
+            assert first.track == "[origin/main: [behind 2]]"
+            assert first.track is second.track
+
     def test_returns_none_when_no_branches(self):
         """Should return None when no branches exist."""
         with (
@@ -714,7 +984,7 @@ class TestGetLocalBranchDetails:
             patch("hug_git_branch._run_git") as mock_run,
             patch("hug_git_branch._run_git_for_each_ref") as mock_for_each,
         ):
-            mock_run.side_effect = ["main", "2\t1"]  # Current branch + divergence
+            mock_run.side_effect = ["main"]  # Current branch only - no per-branch rev-list
 
             mock_for_each.return_value = [
                 "main",
@@ -722,14 +992,57 @@ class TestGetLocalBranchDetails:
                 "2024-01-15",
                 "Initial commit",
                 "origin/main",
-                "",
+                "[ahead 2, behind 1]",
                 "",
             ]
 
             result = hug_git_branch.get_local_branch_details(batch_divergence=True)
 
-            # Track string should include divergence
-            assert "ahead 2" in result.branches[0].track or "behind 1" in result.branches[0].track
+            # Track string should include divergence read from %(upstream:track)
+            assert result.branches[0].track == "[origin/main: [ahead 2, behind 1]]"
+            assert mock_run.call_count == 1
+
+    def test_divergence_skipped_when_disabled(self):
+        """Should keep plain [upstream] track strings when batch_divergence=False."""
+        with (
+            patch("hug_git_branch._run_git") as mock_run,
+            patch("hug_git_branch._run_git_for_each_ref") as mock_for_each,
+        ):
+            mock_run.return_value = "main"
+            mock_for_each.return_value = [
+                "main",
+                "abc123",
+                "2024-01-15",
+                "Initial commit",
+                "origin/main",
+                "[ahead 2]",
+                "",
+            ]
+
+            result = hug_git_branch.get_local_branch_details(batch_divergence=False)
+
+            assert result.branches[0].track == "[origin/main]"
+
+    def test_gone_upstream_has_no_divergence(self):
+        """Should show plain [upstream] when git reports the upstream as gone."""
+        with (
+            patch("hug_git_branch._run_git") as mock_run,
+            patch("hug_git_branch._run_git_for_each_ref") as mock_for_each,
+        ):
+            mock_run.return_value = "main"
+            mock_for_each.return_value = [
+                "main",
+                "abc123",
+                "2024-01-15",
+                "Initial commit",
+                "origin/main",
+                "[gone]",
+                "",
+            ]
+
+            result = hug_git_branch.get_local_branch_details()
+
+            assert result.branches[0].track == "[origin/main]"
 
 
 ################################################################################
@@ -836,6 +1149,136 @@ class TestGetRemoteBranchDetails:
             assert result.max_len == len("very-long-branch")
 
 
+################################################################################
+# TestGetAllBranchDetails
+################################################################################
+
+
+class TestGetAllBranchDetails:
+    """Tests for get_all_branch_details function."""
+
+    LOCAL_MAIN = ["refs/heads/main", "*", "main", "abc123", "2024-01-15", "Local commit"]
+    REMOTE_MAIN = ["refs/remotes/origin/main", " ", "origin/main", "def456", "2024-01-16"]
+
+    def test_uses_single_git_subprocess(self):
+        """Should list local and remote refs with one for-each-ref call."""
+        fields = [
+            *self.LOCAL_MAIN,
+            "origin/main",
+            "[ahead 1]",
+            *self.REMOTE_MAIN,
+            "Remote commit",
+            "",
+            "",
+        ]
+        with (
+            patch("hug_git_branch._run_git") as mock_run,
+            patch("hug_git_branch._run_git_stream", return_value=iter(fields)) as mock_stream,
+        ):
+            local, remote = hug_git_branch.get_all_branch_details(sort_ascending=True)
+
+            mock_run.assert_not_called()
+            mock_stream.assert_called_once()
+            args = mock_stream.call_args.args[0]
+            assert args[-2:] == ["refs/heads/", "refs/remotes/"]
+            assert "--sort=committerdate" in args
+            # HEADs and backups are filtered in Python, so any git version lists in one call
+            assert not any(arg.startswith("--exclude") for arg in args)
+
+            assert local.current_branch == "main"
+            assert [(b.name, b.track) for b in local.branches] == [
+                ("main", "[origin/main: [ahead 1]]")
+            ]
+            assert remote.current_branch == ""
+            assert [(b.name, b.remote_ref, b.subject) for b in remote.branches] == [
+                ("main", "origin/main", "Remote commit")
+            ]
+
+    def test_partitions_without_subjects(self):
+        """Should keep records aligned when subjects are omitted."""
+        fields = [
+            *self.LOCAL_MAIN[:5],
+            "",
+            "",
+            *self.REMOTE_MAIN,
+            "",
+            "",
+        ]
+        with patch("hug_git_branch._run_git_for_each_ref_multi", return_value=fields) as mock_multi:
+            local, remote = hug_git_branch.get_all_branch_details(include_subjects=False)
+
+            assert "%(subject)" not in mock_multi.call_args.args[0]
+            assert [(b.name, b.hash, b.subject) for b in local.branches] == [("main", "abc123", "")]
+            assert [(b.remote_ref, b.date) for b in remote.branches] == [
+                ("origin/main", "2024-01-16")
+            ]
+
+    def test_detached_head_falls_back_to_show_current(self):
+        """Should ask git for the current branch when no listed ref is HEAD."""
+        fields = ["refs/heads/main", " ", "main", "abc123", "2024-01-15", "Subject", "", ""]
+        with (
+            patch("hug_git_branch._run_git", return_value="") as mock_run,
+            patch("hug_git_branch._run_git_for_each_ref_multi", return_value=fields),
+        ):
+            local, remote = hug_git_branch.get_all_branch_details()
+
+            mock_run.assert_called_once_with(["branch", "--show-current"], check=False)
+            assert local.current_branch == "detached HEAD"
+            assert remote is None
+
+    def test_returns_none_for_empty_output(self):
+        """Should return (None, None) when there are no refs."""
+        with (
+            patch("hug_git_branch._run_git", return_value="main"),
+            patch("hug_git_branch._run_git_for_each_ref_multi", return_value=[]),
+        ):
+            assert hug_git_branch.get_all_branch_details() == (None, None)
+
+    def test_picks_wip_branches_from_the_same_listing(self):
+        """Should build WIP details from local records matching the prefix."""
+        fields = [
+            *self.LOCAL_MAIN,
+            "",
+            "",
+            "refs/heads/WIP/spike",
+            " ",
+            "WIP/spike",
+            "fed987",
+            "2024-01-17",
+            "Spike",
+            "",
+            "",
+        ]
+        with patch("hug_git_branch._run_git_for_each_ref_multi", return_value=fields) as mock_multi:
+            local, remote, wip = hug_git_branch._get_branch_namespaces(
+                wip_pattern="refs/heads/WIP/"
+            )
+
+            mock_multi.assert_called_once()
+            assert [b.name for b in local.branches] == ["main", "WIP/spike"]
+            assert remote is None
+            assert wip.current_branch == ""
+            assert [(b.name, b.hash, b.subject) for b in wip.branches] == [
+                ("WIP/spike", "fed987", "Spike")
+            ]
+
+    @pytest.mark.parametrize(
+        ("pattern", "shared"),
+        [
+            ("refs/heads/WIP/", True),
+            ("refs/heads/temp/", True),
+            ("refs/heads/WIP", False),
+            ("refs/heads/WIP/*", False),
+            ("refs/remotes/origin/WIP/", False),
+            ("refs/heads/", False),
+            ("refs/heads/hug-backups/WIP/", False),
+        ],
+    )
+    def test_shares_listing_only_for_exact_prefixes(self, pattern, shared):
+        """Should only reuse the listing when prefix filtering matches for-each-ref."""
+        assert hug_git_branch._shares_ref_listing(pattern) is shared
+
+
 ################################################################################
 # TestGetWipBranchDetails
 ################################################################################
@@ -913,25 +1356,28 @@ class TestFindRemoteBranch:
 
     def test_finds_branch_by_full_remote_ref(self):
         """Should return full ref if given full ref exists."""
-        with patch("hug_git_branch._run_git") as mock_run:
-            # Mock show-ref --verify success - it returns empty string on success
-            mock_run.return_value = ""
-
+        with (
+            patch.object(hug_git_branch._ref_resolver, "exists", return_value=True) as mock_exists,
+            patch("hug_git_branch._run_git") as mock_run,
+        ):
             result = hug_git_branch.find_remote_branch("origin/feature")
 
             assert result == "origin/feature"
+            mock_exists.assert_called_once_with("refs/remotes/origin/feature")
+            mock_run.assert_not_called()
+
+    def test_falls_back_to_listing_when_full_ref_missing(self):
+        """Should search by short name when the slash-containing ref is not found."""
+        with (
+            patch.object(hug_git_branch._ref_resolver, "exists", return_value=False),
+            patch("hug_git_branch._run_git", return_value="origin/team/feature"),
+        ):
+            assert hug_git_branch.find_remote_branch("team/feature") == "origin/team/feature"
 
     def test_finds_branch_by_short_name(self):
         """Should find remote branch by short name."""
-        from subprocess import CalledProcessError
-
-        def side_effect_func(*args, **kwargs):
-            if "show-ref" in args[0]:
-                raise CalledProcessError(1, "git")
-            return "origin/feature\nupstream/feature"
-
         with patch("hug_git_branch._run_git") as mock_run:
-            mock_run.side_effect = side_effect_func
+            mock_run.return_value = "origin/feature\nupstream/feature"
 
             result = hug_git_branch.find_remote_branch("feature")
 
@@ -940,15 +1386,8 @@ class TestFindRemoteBranch:
 
     def test_prefers_origin_when_multiple_remotes(self):
         """Should prefer origin when multiple remotes have same branch."""
-        from subprocess import CalledProcessError
-
-        def side_effect_func(*args, **kwargs):
-            if "show-ref" in args[0]:
-                raise CalledProcessError(1, "git")
-            return "upstream/feature\nfork/feature\norigin/feature"
-
         with patch("hug_git_branch._run_git") as mock_run:
-            mock_run.side_effect = side_effect_func
+            mock_run.return_value = "upstream/feature\nfork/feature\norigin/feature"
 
             result = hug_git_branch.find_remote_branch("feature")
 
@@ -956,15 +1395,8 @@ class TestFindRemoteBranch:
 
     def test_returns_alphabetically_first_when_no_origin(self):
         """Should return alphabetically first when no origin match."""
-        from subprocess import CalledProcessError
-
-        def side_effect_func(*args, **kwargs):
-            if "show-ref" in args[0]:
-                raise CalledProcessError(1, "git")
-            return "fork/feature\nupstream/feature"
-
         with patch("hug_git_branch._run_git") as mock_run:
-            mock_run.side_effect = side_effect_func
+            mock_run.return_value = "fork/feature\nupstream/feature"
 
             result = hug_git_branch.find_remote_branch("feature")
 
@@ -973,19 +1405,100 @@ class TestFindRemoteBranch:
 
     def test_returns_none_when_not_found(self):
         """Should return None when branch doesn't exist."""
-        from subprocess import CalledProcessError
-
-        def side_effect_func(*args, **kwargs):
-            if "show-ref" in args[0]:
-                raise CalledProcessError(1, "git")
-            return ""  # No matches from for-each-ref
-
         with patch("hug_git_branch._run_git") as mock_run:
-            mock_run.side_effect = side_effect_func
+            mock_run.return_value = ""  # No matches from for-each-ref
 
             result = hug_git_branch.find_remote_branch("nonexistent")
 
             assert result is None
+            mock_run.assert_called_once_with(
+                ["for-each-ref", "--format=%(refname:short)", "refs/remotes/"]
+            )
+
+
+################################################################################
+# TestGitRefResolver
+################################################################################
+
+
+class TestGitRefResolver:
+    """Tests for the persistent cat-file ref resolver."""
+
+    @staticmethod
+    def _popen(mock_popen, *responses):
+        proc = mock_popen.return_value
+        proc.poll.return_value = None
+        proc.stdout.readline.side_effect = list(responses)
+        return proc
+
+    def test_reuses_one_process_for_many_lookups(self):
+        """Should answer each query with a line on the same cat-file process."""
+        resolver = hug_git_branch._GitRefResolver()
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            proc = self._popen(mock_popen, "abc123\n", "refs/remotes/origin/x missing\n")
+
+            assert resolver.exists("refs/remotes/origin/main") is True
+            assert resolver.exists("refs/remotes/origin/x") is False
+
+            mock_popen.assert_called_once()
+            argv = mock_popen.call_args.args[0]
+            assert argv[-2:] == ["cat-file", "--batch-check=%(objectname)"]
+            assert [c.args[0] for c in proc.stdin.write.call_args_list] == [
+                "refs/remotes/origin/main\n",
+                "refs/remotes/origin/x\n",
+            ]
+
+    @pytest.mark.parametrize(
+        "ref",
+        ["", "refs/remotes/origin/main~1", "refs/remotes/a..b", "refs/remotes/x@{1}", "a b"],
+    )
+    def test_rejects_revision_syntax_without_git(self, ref):
+        """Should treat names git cannot store as refs as missing."""
+        resolver = hug_git_branch._GitRefResolver()
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            assert resolver.exists(ref) is False
+            mock_popen.assert_not_called()
+
+    def test_restarts_when_working_directory_changes(self):
+        """Should not answer for a repository the caller has left."""
+        resolver = hug_git_branch._GitRefResolver()
+        with (
+            patch("hug_git_branch.subprocess.Popen") as mock_popen,
+            patch("hug_git_branch.os.getcwd", side_effect=["/repo/a", "/repo/b"]),
+        ):
+            proc = self._popen(mock_popen, "abc123\n", "abc123\n")
+
+            resolver.exists("refs/remotes/origin/main")
+            resolver.exists("refs/remotes/origin/main")
+
+            assert mock_popen.call_count == 2
+            proc.stdin.close.assert_called_once()
+
+    @pytest.mark.parametrize("var", ["GIT_DIR", "GIT_WORK_TREE"])
+    def test_restarts_when_git_environment_changes(self, monkeypatch, var):
+        """Should not answer for the old repository after GIT_DIR/GIT_WORK_TREE change."""
+        resolver = hug_git_branch._GitRefResolver()
+        monkeypatch.delenv("GIT_DIR", raising=False)
+        monkeypatch.delenv("GIT_WORK_TREE", raising=False)
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            proc = self._popen(mock_popen, "abc123\n", "abc123\n", "abc123\n")
+
+            resolver.exists("refs/remotes/origin/main")
+            monkeypatch.setenv(var, "/repo/b/.git")
+            resolver.exists("refs/remotes/origin/main")
+            resolver.exists("refs/remotes/origin/main")
+
+            assert mock_popen.call_count == 2
+            proc.stdin.close.assert_called_once()
+
+    def test_exited_process_reports_missing(self):
+        """Should return False and drop the process when git has exited."""
+        resolver = hug_git_branch._GitRefResolver()
+        with patch("hug_git_branch.subprocess.Popen") as mock_popen:
+            proc = self._popen(mock_popen, "")
+
+            assert resolver.exists("refs/remotes/origin/main") is False
+            proc.wait.assert_called_once()
 
 
 ################################################################################
@@ -1173,6 +1686,139 @@ class TestMainFunction:
         # argparse uses exit code 2
         assert exc_info.value.code == 2
 
+    def test_all_mode_outputs_one_json_object(self, monkeypatch, capsys):
+        """Should combine local, remote and WIP results, with null for empty modes."""
+        import sys
+
+        monkeypatch.setattr(sys, "argv", ["hug_git_branch.py", "all", "--json"])
+        local = hug_git_branch.BranchDetails(
+            current_branch="main",
+            max_len=4,
+            branches=[hug_git_branch.BranchInfo(name="main", hash="abc123")],
+        )
+
+        with (
+            patch(
+                "hug_git_branch._get_branch_namespaces", return_value=(local, None, None)
+            ) as mock_namespaces,
+            patch("hug_git_branch.get_wip_branch_details") as mock_wip,
+        ):
+            hug_git_branch.main()
+
+        out = capsys.readouterr().out
+        assert out == (
+            '{"local":{"current_branch":"main","max_len":4,"branches":[{"name":"main",'
+            '"hash":"abc123","date":"","subject":"","track":"","remote_ref":""}]},'
+            '"remote":null,"wip":null}\n'
+        )
+        data = json.loads(out)
+        assert data["local"]["branches"][0]["name"] == "main"
+        assert data["remote"] is None
+        assert data["wip"] is None
+        assert mock_namespaces.call_args.kwargs["wip_pattern"] == "refs/heads/WIP/"
+        mock_wip.assert_not_called()
+
+    def test_all_mode_runs_wip_query_concurrently(self):
+        """Should overlap a separate WIP listing with the local/remote listing."""
+        import threading
+
+        started = {"all": threading.Event(), "wip": threading.Event()}
+
+        def rendezvous(name, other, result):
+            def wait_for_other(**kwargs):
+                started[name].set()
+                assert started[other].wait(timeout=5), "queries ran one after another"
+                return result
+
+            return wait_for_other
+
+        with (
+            patch(
+                "hug_git_branch.get_all_branch_details",
+                side_effect=rendezvous("all", "wip", (None, None)),
+            ),
+            patch(
+                "hug_git_branch.get_wip_branch_details", side_effect=rendezvous("wip", "all", None)
+            ),
+        ):
+            modes = hug_git_branch._get_all_modes(wip_pattern="refs/heads/WIP/*")
+
+        assert modes == {"local": None, "remote": None, "wip": None}
+
+    def test_all_mode_requires_json(self, monkeypatch):
+        """Should reject 'all' without --json, as bash variables would collide."""
+        import sys
+
+        monkeypatch.setattr(sys, "argv", ["hug_git_branch.py", "all"])
+
+        with pytest.raises(SystemExit) as exc_info:
+            hug_git_branch.main()
+
+        assert exc_info.value.code == 2
+
+    def test_all_mode_exits_1_when_no_branches(self, monkeypatch):
+        """Should exit 1 when every mode is empty."""
+        import sys
+
+        monkeypatch.setattr(sys, "argv", ["hug_git_branch.py", "all", "--json"])
+
+        with (
+            patch("hug_git_branch._get_branch_namespaces", return_value=(None, None, None)),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            hug_git_branch.main()
+
+        assert exc_info.value.code == 1
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            ["local"],
+            ["local", "--sort-context=gum-single"],
+            ["local", "--sort-context", "static", "--ascending"],
+            ["remote"],
+            ["wip", "--pattern", "refs/heads/WIP/", "--json"],
+            ["--json", "all"],
+        ],
+    )
+    def test_fast_parser_matches_argparse(self, argv):
+        """Should parse the wrapper invocations exactly as argparse does."""
+        fast = hug_git_branch._parse_args_fast(argv)
+
+        assert fast is not None
+        assert vars(fast) == vars(hug_git_branch._parse_args(argv))
+
+    @pytest.mark.parametrize(
+        "argv",
+        [
+            [],
+            ["-h"],
+            ["local", "--asc"],
+            ["local", "--pattern"],
+            ["local", "--sort-context", "bad", "--sort-context=static"],
+            ["all"],
+            ["local", "remote"],
+        ],
+    )
+    def test_fast_parser_defers_help_and_errors_to_argparse(self, argv):
+        """Should return None for anything argparse must handle or report."""
+        assert hug_git_branch._parse_args_fast(argv) is None
+
+    def test_common_invocation_skips_argparse(self, monkeypatch):
+        """Should not build the argparse parser for a plain invocation."""
+        import sys
+
+        monkeypatch.setattr(sys, "argv", ["hug_git_branch.py", "remote"])
+
+        with (
+            patch("hug_git_branch.get_remote_branch_details", return_value=None),
+            patch("hug_git_branch._parse_args") as mock_parse,
+            pytest.raises(SystemExit),
+        ):
+            hug_git_branch.main()
+
+        mock_parse.assert_not_called()
+
 
 ################################################################################
 # TestEdgeCases
@@ -6,6 +6,7 @@ Tests JSON transformation utilities including commit search,
 git log transformation, and status transformation.
 """
 
+import io
 import json
 import os
 import sys
@@ -14,9 +15,11 @@ from unittest.mock import patch
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import json_transform
 from json_transform import (
     _status_to_type,
     commit_search,
+    stream_git_log_to_json,
     transform_git_log_to_json,
     transform_git_status_to_json,
     validate_json_schema,
@@ -41,6 +44,37 @@ class TestStatusToType:
     def test_unknown(self):
         assert _status_to_type("X") == "unknown"
 
+    def test_remaining_codes(self):
+        assert _status_to_type("C") == "copied"
+        assert _status_to_type("U") == "conflict"
+        assert _status_to_type("T") == "type_changed"
+
+    def test_malformed_codes_are_unknown(self):
+        assert _status_to_type("") == "unknown"
+        assert _status_to_type("MM") == "unknown"
+        assert _status_to_type("€") == "unknown"
+
+
+class TestJsonBackend:
+    """Test that both serializers emit indent-2 JSON with the requested item separator"""
+
+    SAMPLE = {
+        "message": 'Fix "quotes", commas\nand café \u2028 😀',
+        "files": [{"path": "a\\b", "added": 3}, {"path": "\x1f", "deleted": None}],
+        "empty": {"list": [], "dict": {}},
+        "flag": True,
+    }
+
+    def test_fallback_matches_default_separator(self):
+        expected = json.dumps(self.SAMPLE, ensure_ascii=False, indent=2)
+        assert json_transform._json_dumps(self.SAMPLE) == expected
+        assert json_transform._json_dumps_stdlib(self.SAMPLE) == expected
+
+    def test_fallback_matches_spaced_separator(self):
+        expected = json.dumps(self.SAMPLE, ensure_ascii=False, indent=2, separators=(", ", ": "))
+        assert json_transform._json_dumps(self.SAMPLE, ", ") == expected
+        assert json_transform._json_dumps_stdlib(self.SAMPLE, ", ") == expected
+
 
 class TestTransformGitLogToJson:
     """Test git log transformation"""
@@ -52,7 +86,7 @@ class TestTransformGitLogToJson:
 
     def test_single_commit(self):
         log_output = (  # noqa: E501
-            "abc123---HUG-FIELD-SEPARATOR---abc---HUG-FIELD-SEPARATOR---John Doe---HUG-FIELD-SEPARATOR---john@example.com---HUG-FIELD-SEPARATOR---2025-01-01 12:00:00 +0000---HUG-FIELD-SEPARATOR---Test commit"  # noqa: E501
+            "abc123\x1fabc\x1fJohn Doe\x1fjohn@example.com\x1f2025-01-01 12:00:00 +0000\x1fTest commit"  # noqa: E501
         )
         result = transform_git_log_to_json(log_output)
         data = json.loads(result)
@@ -67,8 +101,8 @@ class TestTransformGitLogToJson:
 
     def test_multiple_commits(self):
         log_output = (  # noqa: E501
-            "abc123---HUG-FIELD-SEPARATOR---abc---HUG-FIELD-SEPARATOR---John Doe---HUG-FIELD-SEPARATOR---john@example.com---HUG-FIELD-SEPARATOR---2025-01-01 12:00:00 +0000---HUG-FIELD-SEPARATOR---First commit\x00"  # noqa: E501
-            "def456---HUG-FIELD-SEPARATOR---def---HUG-FIELD-SEPARATOR---Jane Smith---HUG-FIELD-SEPARATOR---jane@example.com---HUG-FIELD-SEPARATOR---2025-01-02 12:00:00 +0000---HUG-FIELD-SEPARATOR---Second commit"  # noqa: E501
+            "abc123\x1fabc\x1fJohn Doe\x1fjohn@example.com\x1f2025-01-01 12:00:00 +0000\x1fFirst commit\x00"  # noqa: E501
+            "def456\x1fdef\x1fJane Smith\x1fjane@example.com\x1f2025-01-02 12:00:00 +0000\x1fSecond commit"  # noqa: E501
         )
         result = transform_git_log_to_json(log_output)
         data = json.loads(result)
@@ -78,7 +112,7 @@ class TestTransformGitLogToJson:
         assert data[1]["sha"] == "def456"
 
     def test_commit_with_special_characters(self):
-        log_output = 'abc123---HUG-FIELD-SEPARATOR---abc---HUG-FIELD-SEPARATOR---John "Doe"---HUG-FIELD-SEPARATOR---john@example.com---HUG-FIELD-SEPARATOR---2025-01-01 12:00:00 +0000---HUG-FIELD-SEPARATOR---Test "quoted" commit'  # noqa: E501
+        log_output = 'abc123\x1fabc\x1fJohn "Doe"\x1fjohn@example.com\x1f2025-01-01 12:00:00 +0000\x1fTest "quoted" commit'  # noqa: E501
         result = transform_git_log_to_json(log_output)
         data = json.loads(result)
 
@@ -86,6 +120,56 @@ class TestTransformGitLogToJson:
         assert data[0]["author"]["name"] == 'John "Doe"'
         assert data[0]["message"] == 'Test "quoted" commit'
 
+    def test_bytes_input(self):
+        log_output = "abc123\x1fabc\x1fJosé\x1fjose@example.com\x1f2025-01-01\x1fCafé\x00".encode()
+        data = json.loads(transform_git_log_to_json(log_output))
+
+        assert data == [
+            {
+                "sha": "abc123",
+                "sha_short": "abc",
+                "author": {"name": "José", "email": "jose@example.com"},
+                "date": "2025-01-01",
+                "message": "Café",
+            }
+        ]
+
+    def test_matches_json_dumps_of_commit_list(self):
+        log_output = "a\x1fa\x1fN\x1fe\x1fd\x1fFirst\nbody\x00b\x1fb\x1fN\x1fe\x1fd\x1fSecond\x1f[]"
+        expected = [
+            {
+                "sha": "a",
+                "sha_short": "a",
+                "author": {"name": "N", "email": "e"},
+                "date": "d",
+                "message": "First\nbody",
+            },
+            {
+                "sha": "b",
+                "sha_short": "b",
+                "author": {"name": "N", "email": "e"},
+                "date": "d",
+                "message": "Second",
+                "files": [],
+            },
+        ]
+        assert transform_git_log_to_json(log_output, with_files=True) == json.dumps(
+            expected, ensure_ascii=False, indent=2, separators=(", ", ": ")
+        )
+
+    def test_stream_writes_each_commit_as_parsed(self):
+        log_output = "a\x1fa\x1fN\x1fe\x1fd\x1fOne\x00b\x1fb\x1fN\x1fe\x1fd\x1fTwo"
+        out = io.StringIO()
+        with patch.object(out, "write", wraps=out.write) as mock_write:
+            stream_git_log_to_json(log_output, out)
+
+        assert mock_write.call_count == 3  # two commits, then the closing bracket
+        assert out.getvalue() == transform_git_log_to_json(log_output)
+
+    def test_old_separator_is_not_split(self):
+        log_output = "abc123---HUG-FIELD-SEPARATOR---abc---HUG-FIELD-SEPARATOR---Test commit"
+        assert json.loads(transform_git_log_to_json(log_output)) == []
+
 
 class TestTransformGitStatusToJson:
     """Test git status transformation"""
@@ -134,6 +218,22 @@ class TestTransformGitStatusToJson:
         assert len(result["unstaged"]) == 1
         assert len(result["untracked"]) == 1
 
+    def test_nul_terminated_matches_line_format(self):
+        lines = "M  staged.txt\n M unstaged.txt\n?? untracked.txt"
+        nul = "M  staged.txt\0 M unstaged.txt\0?? untracked.txt\0"
+        assert transform_git_status_to_json(nul) == transform_git_status_to_json(lines)
+
+    def test_nul_terminated_rename_skips_original_path(self):
+        status_output = b"R  new name.txt\0old name.txt\0 M other.txt\0"
+        result = transform_git_status_to_json(status_output)
+
+        assert result["staged"] == [{"path": "new name.txt", "status": "renamed"}]
+        assert result["unstaged"] == [{"path": "other.txt", "status": "modified"}]
+
+    def test_bytes_input_is_decoded(self):
+        result = transform_git_status_to_json("?? café.txt\0".encode())
+        assert result["untracked"] == [{"path": "café.txt", "status": "untracked"}]
+
 
 class TestValidateJsonSchema:
     """Test JSON schema validation"""
@@ -158,6 +258,26 @@ class TestValidateJsonSchema:
         json_data = '{"repository": "/path"}'
         assert validate_json_schema(json_data, "status") is False
 
+    def test_non_object_is_invalid(self):
+        assert validate_json_schema('["repository", "status"]', "status") is False
+        assert validate_json_schema('"repository status"', "status") is False
+
+    def test_unknown_schema_accepts_any_json(self):
+        assert validate_json_schema("[]", "no_such_schema") is True
+
+    def test_stdlib_fallback_matches_compiled_validators(self):
+        samples = [
+            {"repository": "/path", "status": {}},
+            {"repository": "/path", "search": {}, "results": []},
+            {"repository": "/path", "branches": []},
+            {"repository": "/path"},
+            ["repository", "status"],
+        ]
+        for name, schema in json_transform._SCHEMAS.items():
+            fallback = json_transform._compile_schema_stdlib(schema)
+            for sample in samples:
+                assert fallback(sample) == json_transform._VALIDATORS[name](sample)
+
 
 class TestCommitSearch:
     """Test commit search functionality using Command Mock Framework"""
@@ -185,12 +305,26 @@ class TestCommitSearch:
     def test_with_files(self, command_mock):
         """Test search with files included."""
         mock_fn = command_mock.get_subprocess_mock("log/search.toml", "with_files")
-        with patch("json_transform.subprocess.run", side_effect=mock_fn):
+        with patch("json_transform.subprocess.run", side_effect=mock_fn) as mock_run:
             result = commit_search("message", "feature", True, False, [])
 
             assert len(result["results"]) == 2
             assert "files" in result["results"][0]
             assert len(result["results"][0]["files"]) == 3
+            # Commits and their files come from a single git log
+            mock_run.assert_called_once()
+            assert "--name-status" in mock_run.call_args.args[0]
+
+    def test_no_body_omits_message_from_format(self):
+        """Test that --no-body stops asking git for the full message."""
+        with patch("json_transform.subprocess.run") as mock_run:
+            mock_run.return_value.returncode = 0
+            mock_run.return_value.stdout = ""
+            commit_search("message", "fix", False, True, [])
+
+        (format_arg,) = [a for a in mock_run.call_args.args[0] if a.startswith("--format=")]
+        assert "%B" not in format_arg
+        assert "%s|~||~|%P" in format_arg
 
     def test_no_match(self, command_mock):
         """Test search with no matching results."""
@@ -212,10 +346,12 @@ class TestCommitSearch:
 
     def test_invalid_search_type(self):
         """Test handling of invalid search type."""
-        result = commit_search("invalid", "test", False, [])
+        with patch("json_transform.subprocess.run") as mock_run:
+            result = commit_search("invalid", "test", False, [])
 
         assert "error" in result
         assert result["error"]["type"] == "invalid_search_type"
+        mock_run.assert_not_called()
 
 
 class TestIntegration:
@@ -232,7 +368,7 @@ class TestIntegration:
 
     def test_unicode_handling(self):
         """Test that Unicode characters are handled correctly"""
-        log_output = "abc123---HUG-FIELD-SEPARATOR---abc---HUG-FIELD-SEPARATOR---Café---HUG-FIELD-SEPARATOR---test@example.com---HUG-FIELD-SEPARATOR---2025-01-01 12:00:00 +0000---HUG-FIELD-SEPARATOR---Test café résumé"  # noqa: E501
+        log_output = "abc123\x1fabc\x1fCafé\x1ftest@example.com\x1f2025-01-01 12:00:00 +0000\x1fTest café résumé"  # noqa: E501
         result = transform_git_log_to_json(log_output)
         data = json.loads(result)
 
@@ -4,12 +4,77 @@ Unit tests for log_json.py module.
 Tests the parsing of git log output with --numstat into JSON format.
 """
 
+import io
+import json
 import os
 import sys
 
+import pytest
+
 # Add parent directory to path to import log_json
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from log_json import parse_log_with_stats
+import log_json
+from log_json import iter_commits, parse_log_with_stats, stream_log_ndjson, write_log_json
+
+
+def _header(
+    sha,
+    subject="Edit",
+    body="",
+    *,
+    message=None,
+    author="Alice",
+    email="alice@example.com",
+    date="2025-11-18T10:00:00Z",
+    date_relative="1 hour ago",
+    tree="tree123",
+    parents="",
+    refs="",
+):
+    """Build one commit record in the hug ll log format
+
+    The %B field defaults to the subject plus an optional body; pass message
+    to give the raw %B text instead (e.g. "" when hug-git-json drops %B for --no-body).
+    """
+    if message is None:
+        message = f"{subject}\n\n{body}" if body else f"{subject}\n"
+    return (
+        f"{sha}|~|{sha[:7]}|~|{author}|~|{email}|~|{author}|~|{email}"
+        f"|~|{date}|~|{date_relative}|~|{date}|~|{date_relative}"
+        f"|~|{tree}|~|{subject}|~|{message}|~|{parents}|~|{refs}\n"
+    )
+
+
+@pytest.fixture(scope="module")
+def large_log():
+    """10k commits with two numstat lines each, built once for the module"""
+    lines = []
+    for i in range(10_000):
+        lines += [_header(f"{i:040x}", subject=f"Change {i}"), "\n"]
+        lines += [f"{i % 7}\t{i % 3}\tsrc/module_{i % 50}.py\n", "-\t-\tassets/logo.png\n"]
+    return lines
+
+
+class TestJsonBackend:
+    """Test compact, non-ASCII-escaping output and the surrogate fallback"""
+
+    SAMPLE = {
+        "message": 'Fix "quotes", commas\nand café \u2028 😀',
+        "files": [{"filename": "a\\b", "additions": 3}, {"filename": "\x1f", "status": None}],
+        "empty": {"list": [], "dict": {}},
+        "flag": True,
+    }
+
+    def test_fallback_matches_compact_dump(self):
+        """Test both serializers emit json.dumps output with no spaces or \\u escapes"""
+        expected = json.dumps(self.SAMPLE, ensure_ascii=False, separators=(",", ":"))
+        assert log_json._json_dumps(self.SAMPLE) == expected
+        assert log_json._json_dumps_stdlib(self.SAMPLE) == expected
+
+    def test_lone_surrogates_fall_back_to_stdlib(self):
+        """Test undecodable input bytes (surrogateescape) still serialize"""
+        sample = {"subject": "caf\udce9"}
+        assert log_json._json_dumps(sample) == log_json._json_dumps_stdlib(sample)
 
 
 class TestParseLogWithStats:
@@ -18,7 +83,10 @@ class TestParseLogWithStats:
     def test_single_commit_basic(self):
         """Test parsing a single commit without stats"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|2 hours ago|~|2025-11-18T10:00:00Z|~|2 hours ago|~|tree123abc456def789012345678901234567890|~|Fix bug|~|Fix bug\n|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Fix bug",
+            )
         ]
 
         commits = parse_log_with_stats(lines)
@@ -35,7 +103,13 @@ class TestParseLogWithStats:
     def test_single_commit_with_body(self):
         """Test parsing commit with multi-line message body"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree456def789012345678901234567890abcdef|~|Add feature|~|Add feature\n\nThis is a longer description.\nWith multiple lines.|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Add feature",
+                "This is a longer description.\nWith multiple lines.",
+                author="Bob",
+                email="bob@example.com",
+            )
         ]
 
         commits = parse_log_with_stats(lines)
@@ -48,7 +122,10 @@ class TestParseLogWithStats:
     def test_single_commit_with_numstat(self):
         """Test parsing commit with file statistics"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree789abc456def012345678901234567890ab|~|Update files|~|Update files\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Update files",
+            ),
             "\n",
             "10\t5\tREADME.md\n",
             "20\t3\tsrc/app.js\n",
@@ -65,7 +142,10 @@ class TestParseLogWithStats:
     def test_binary_file_in_numstat(self):
         """Test handling binary files (marked with -)"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree012abc456def789012345678901234567890|~|Add image|~|Add image\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Add image",
+            ),
             "\n",
             "-\t-\timage.png\n",
             "5\t2\tREADME.md\n",
@@ -83,11 +163,20 @@ class TestParseLogWithStats:
     def test_multiple_commits(self):
         """Test parsing multiple commits"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|2 hours ago|~|2025-11-18T10:00:00Z|~|2 hours ago|~|tree345abc456def789012345678901234567890|~|First commit|~|First commit\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "First commit",
+            ),
             "\n",
             "10\t5\tfile1.txt\n",
             "\n",
-            "def456abc789012345678901234567890abcdef0|~|def456a|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T11:00:00Z|~|1 hour ago|~|2025-11-18T11:00:00Z|~|1 hour ago|~|tree678def012345678901234567890abcdef12|~|Second commit|~|Second commit\n|~||~|\n",  # noqa: E501
+            _header(
+                "def456abc789012345678901234567890abcdef0",
+                "Second commit",
+                author="Bob",
+                email="bob@example.com",
+                date="2025-11-18T11:00:00Z",
+            ),
             "\n",
             "20\t10\tfile2.txt\n",
         ]
@@ -100,10 +189,25 @@ class TestParseLogWithStats:
         assert commits[1]["sha"] == "def456abc789012345678901234567890abcdef0"
         assert commits[1]["stats"]["insertions"] == 20
 
+    def test_repeated_identities_and_paths_share_strings(self):
+        """Test names, emails and filenames repeated across commits are one object"""
+        lines = [_header("a" * 40), "\n", "1\t1\tREADME.md\n"]
+        lines += [_header("b" * 40), "\n", "2\t0\tREADME.md\n"]
+
+        first, second = parse_log_with_stats(lines)
+
+        assert first["author"]["name"] is second["author"]["name"]
+        assert first["committer"]["email"] is second["committer"]["email"]
+        assert first["files"][0]["filename"] is second["files"][0]["filename"]
+
     def test_commit_with_refs(self):
         """Test parsing commit with branch/tag refs"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree901abc456def789012345678901234567890|~|Tagged commit|~|Tagged commit\n|~||~|HEAD -> main, origin/main, tag: v1.0\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Tagged commit",
+                refs="HEAD -> main, origin/main, tag: v1.0",
+            )
         ]
 
         commits = parse_log_with_stats(lines)
@@ -118,7 +222,14 @@ class TestParseLogWithStats:
     def test_commit_with_multiple_parents(self):
         """Test merge commit with multiple parents"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree234abc456def789012345678901234567890|~|Merge branch|~|Merge branch\n|~|parent1abc456def789012345678901234567890 parent2def789abc012345678901234567890ab|~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Merge branch",
+                parents=(
+                    "parent1abc456def789012345678901234567890 "
+                    "parent2def789abc012345678901234567890ab"
+                ),
+            )
         ]
 
         commits = parse_log_with_stats(lines)
@@ -140,7 +251,10 @@ class TestParseLogWithStats:
     def test_commit_with_no_stats(self):
         """Test commit where no files changed (stats should be zero)"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree567abc456def789012345678901234567890|~|Empty commit|~|Empty commit\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Empty commit",
+            ),
             "\n",
         ]
 
@@ -155,7 +269,10 @@ class TestParseLogWithStats:
     def test_malformed_numstat_line(self):
         """Test that malformed numstat lines are skipped gracefully"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree890abc456def789012345678901234567890|~|Update|~|Update\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Update",
+            ),
             "\n",
             "10\t5\tvalid_file.txt\n",
             "malformed line without tabs\n",
@@ -174,7 +291,11 @@ class TestParseLogWithStats:
     def test_commit_with_special_characters_in_message(self):
         """Test commit message with special characters"""
         lines = [
-            'abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree123def456789012345678901234567890ab|~|Fix "bug" in <module>|~|Fix "bug" in <module>\n\nDetailed description with special chars: $, %, &|~||~|\n'  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                'Fix "bug" in <module>',
+                "Detailed description with special chars: $, %, &",
+            )
         ]
 
         commits = parse_log_with_stats(lines)
@@ -187,7 +308,10 @@ class TestParseLogWithStats:
     def test_commit_with_empty_refs(self):
         """Test commit with no refs"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree456def789012345678901234567890abcdef|~|No refs|~|No refs\n|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "No refs",
+            )
         ]
 
         commits = parse_log_with_stats(lines)
@@ -199,7 +323,22 @@ class TestParseLogWithStats:
     def test_real_world_commit_format(self):
         """Test with a more realistic commit structure"""
         lines = [
-            "e1bb93c05d8699243d43c9148a00804ae79cffff|~|e1bb93c|~|Elifarley C|~|elifarley@gmail.com|~|Elifarley C|~|elifarley@gmail.com|~|2025-11-18T19:19:14-03:00|~|12 minutes ago|~|2025-11-18T19:19:14-03:00|~|12 minutes ago|~|tree258d41a972c0e71100a1c64ca75de03bfc694|~|feat: add comprehensive JSON output support for analysis commands (Phase 4a)|~|feat: add comprehensive JSON output support for analysis commands (Phase 4a)\n\nWHY: JSON output enables automation.\n\nWHAT: Added JSON support to 4 commands.\n\nIMPACT: Users can now pipe output to jq.|~|258d41a972c0e71100a1c64ca75de03bfc6943d1|~|HEAD -> main\n",  # noqa: E501
+            _header(
+                "e1bb93c05d8699243d43c9148a00804ae79cffff",
+                "feat: add comprehensive JSON output support for analysis commands (Phase 4a)",
+                (
+                    "WHY: JSON output enables automation.\n\n"
+                    "WHAT: Added JSON support to 4 commands.\n\n"
+                    "IMPACT: Users can now pipe output to jq."
+                ),
+                author="Elifarley C",
+                email="elifarley@gmail.com",
+                date="2025-11-18T19:19:14-03:00",
+                date_relative="12 minutes ago",
+                tree="tree258d41a972c0e71100a1c64ca75de03bfc694",
+                parents="258d41a972c0e71100a1c64ca75de03bfc6943d1",
+                refs="HEAD -> main",
+            ),
             "\n",
             "11\t3\tREADME.md\n",
             "47\t23\tdocs/planning/json-output-roadmap.md\n",
@@ -229,7 +368,12 @@ class TestEdgeCases:
         """Test handling of incomplete commit lines"""
         lines = [
             "abc123|~|abc|~|Alice\n",  # Incomplete - missing fields
-            "def456abc789012345678901234567890abcdef0|~|def456a|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree012abc456def789012345678901234567890|~|Valid commit|~|Valid commit\n|~||~|\n",  # noqa: E501
+            _header(
+                "def456abc789012345678901234567890abcdef0",
+                "Valid commit",
+                author="Bob",
+                email="bob@example.com",
+            ),
         ]
 
         commits = parse_log_with_stats(lines)
@@ -241,11 +385,20 @@ class TestEdgeCases:
     def test_blank_lines_between_commits(self):
         """Test that blank lines are handled correctly"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree345abc456def789012345678901234567890|~|First|~|First\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "First",
+            ),
             "\n",
             "\n",
             "\n",
-            "def456abc789012345678901234567890abcdef0|~|def456a|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T11:00:00Z|~|1 hour ago|~|2025-11-18T11:00:00Z|~|1 hour ago|~|tree678def012345678901234567890abcdef12|~|Second|~|Second\n|~||~|\n",  # noqa: E501
+            _header(
+                "def456abc789012345678901234567890abcdef0",
+                "Second",
+                author="Bob",
+                email="bob@example.com",
+                date="2025-11-18T11:00:00Z",
+            ),
         ]
 
         commits = parse_log_with_stats(lines)
@@ -255,7 +408,13 @@ class TestEdgeCases:
     def test_unicode_in_commit_message(self):
         """Test handling of Unicode characters"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|José García|~|jose@example.com|~|José García|~|jose@example.com|~|2025-11-18T10:00:00Z|~|1 hour ago|~|2025-11-18T10:00:00Z|~|1 hour ago|~|tree901abc456def789012345678901234567890|~|Add emoji support 🎉|~|Add emoji support 🎉\n\nSupports UTF-8: ñ, é, 中文|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Add emoji support 🎉",
+                "Supports UTF-8: ñ, é, 中文",
+                author="José García",
+                email="jose@example.com",
+            )
         ]
 
         commits = parse_log_with_stats(lines)
@@ -273,7 +432,10 @@ class TestConditionalStats:
     def test_stats_included_when_flag_true(self):
         """Test stats field is present when include_stats=True"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|2 hours ago|~|2025-11-18T10:00:00Z|~|2 hours ago|~|tree123abc|~|Fix bug|~|Fix bug\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Fix bug",
+            ),
             "\n",
             "10\t5\tREADME.md\n",
         ]
@@ -290,7 +452,10 @@ class TestConditionalStats:
     def test_stats_excluded_when_flag_false(self):
         """Test stats field is absent when include_stats=False"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|2 hours ago|~|2025-11-18T10:00:00Z|~|2 hours ago|~|tree123abc|~|Fix bug|~|Fix bug\n|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Fix bug",
+            ),
             "\n",
             "10\t5\tREADME.md\n",
         ]
@@ -307,7 +472,10 @@ class TestConditionalStats:
     def test_stats_included_by_default(self):
         """Test stats field defaults to included (backward compatibility)"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|2 hours ago|~|2025-11-18T10:00:00Z|~|2 hours ago|~|tree123abc|~|Fix bug|~|Fix bug\n|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Fix bug",
+            )
         ]
 
         commits = parse_log_with_stats(lines)  # No include_stats arg
@@ -324,7 +492,14 @@ class TestNoBodyFlag:
     def test_body_omitted_when_flag_true(self):
         """Test body is None and message=subject when omit_body=True"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T11:00:00Z|~|1 hour ago|~|2025-11-18T11:00:00Z|~|1 hour ago|~|tree456def|~|Add feature|~|Add feature\n\nThis is a detailed description.\nWith multiple lines.|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Add feature",
+                "This is a detailed description.\nWith multiple lines.",
+                author="Bob",
+                email="bob@example.com",
+                date="2025-11-18T11:00:00Z",
+            )
         ]
 
         commits = parse_log_with_stats(lines, omit_body=True)
@@ -338,7 +513,14 @@ class TestNoBodyFlag:
     def test_body_included_when_flag_false(self):
         """Test body is present when omit_body=False"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T11:00:00Z|~|1 hour ago|~|2025-11-18T11:00:00Z|~|1 hour ago|~|tree456def|~|Add feature|~|Add feature\n\nThis is a detailed description.\nWith multiple lines.|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Add feature",
+                "This is a detailed description.\nWith multiple lines.",
+                author="Bob",
+                email="bob@example.com",
+                date="2025-11-18T11:00:00Z",
+            )
         ]
 
         commits = parse_log_with_stats(lines, omit_body=False)
@@ -355,7 +537,14 @@ class TestNoBodyFlag:
     def test_body_included_by_default(self):
         """Test body defaults to included (backward compatibility)"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T11:00:00Z|~|1 hour ago|~|2025-11-18T11:00:00Z|~|1 hour ago|~|tree456def|~|Add feature|~|Add feature\n\nDetailed body text.|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Add feature",
+                "Detailed body text.",
+                author="Bob",
+                email="bob@example.com",
+                date="2025-11-18T11:00:00Z",
+            )
         ]
 
         commits = parse_log_with_stats(lines)  # No omit_body arg
@@ -368,7 +557,10 @@ class TestNoBodyFlag:
     def test_no_body_with_subject_only_commit(self):
         """Test --no-body flag on commit that has no body anyway"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|2 hours ago|~|2025-11-18T10:00:00Z|~|2 hours ago|~|tree123abc|~|Quick fix|~|Quick fix\n|~||~|\n"  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Quick fix",
+            )
         ]
 
         commits = parse_log_with_stats(lines, omit_body=True)
@@ -379,6 +571,34 @@ class TestNoBodyFlag:
         assert commit["body"] is None
         assert commit["message"] == "Quick fix"
 
+    def test_no_body_with_empty_message_field(self):
+        """Test --no-body input where hug-git-json drops %B from the format"""
+        lines = [
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Add feature",
+                message="",
+                author="Bob",
+                email="bob@example.com",
+                date="2025-11-18T11:00:00Z",
+                parents="parent1",
+                refs="HEAD -> main",
+            ),
+            "\n",
+            "3\t1\tsrc/app.py\n",
+        ]
+
+        commits = parse_log_with_stats(lines, omit_body=True)
+
+        assert len(commits) == 1
+        commit = commits[0]
+        assert commit["subject"] == "Add feature"
+        assert commit["body"] is None
+        assert commit["message"] == "Add feature"
+        assert commit["parents"] == [{"sha": "parent1"}]
+        assert commit["refs"] == ["HEAD", "main"]
+        assert commit["stats"]["insertions"] == 3
+
 
 class TestCombinedFlags:
     """Test combining include_stats and omit_body flags (new 15-field format)"""
@@ -386,7 +606,11 @@ class TestCombinedFlags:
     def test_no_stats_no_body(self):
         """Test with both stats excluded and body omitted"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Alice|~|alice@example.com|~|Alice|~|alice@example.com|~|2025-11-18T10:00:00Z|~|2 hours ago|~|2025-11-18T10:00:00Z|~|2 hours ago|~|tree123abc|~|Update docs|~|Update docs\n\nAdded new examples.|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Update docs",
+                "Added new examples.",
+            ),
             "\n",
             "5\t2\tREADME.md\n",
         ]
@@ -403,7 +627,14 @@ class TestCombinedFlags:
     def test_with_stats_no_body(self):
         """Test with stats included but body omitted"""
         lines = [
-            "abc123def456789012345678901234567890abcd|~|abc123d|~|Bob|~|bob@example.com|~|Bob|~|bob@example.com|~|2025-11-18T11:00:00Z|~|1 hour ago|~|2025-11-18T11:00:00Z|~|1 hour ago|~|tree456def|~|Refactor code|~|Refactor code\n\nImproved performance.|~||~|\n",  # noqa: E501
+            _header(
+                "abc123def456789012345678901234567890abcd",
+                "Refactor code",
+                "Improved performance.",
+                author="Bob",
+                email="bob@example.com",
+                date="2025-11-18T11:00:00Z",
+            ),
             "\n",
             "15\t8\tsrc/main.py\n",
         ]
@@ -416,3 +647,113 @@ class TestCombinedFlags:
         assert commit["stats"]["insertions"] == 15
         assert commit["body"] is None
         assert commit["message"] == "Refactor code"
+
+
+class TestStreaming:
+    """Test lazy parsing and streamed JSON output"""
+
+    LINES = [
+        _header(
+            "abc123def456789012345678901234567890abcd",
+            "First commit",
+        ),
+        "\n",
+        "10\t5\tfile1.txt\n",
+        "\n",
+        _header(
+            "def456abc789012345678901234567890abcdef0",
+            "Second commit",
+            author="Bob",
+            email="bob@example.com",
+            date="2025-11-18T09:00:00Z",
+        ),
+        "\n",
+        "20\t10\tfile2.txt\n",
+    ]
+
+    def test_iter_commits_yields_before_input_is_exhausted(self):
+        """Test the first commit is available once the next header is read"""
+        remaining = iter(self.LINES)
+
+        first = next(iter_commits(remaining))
+
+        assert first["sha"] == "abc123def456789012345678901234567890abcd"
+        assert list(remaining) == self.LINES[5:]
+
+    def test_write_log_json_matches_single_dump(self):
+        """Test streamed output is identical to dumping the whole object"""
+        commits = parse_log_with_stats(self.LINES)
+        expected = {
+            "command": "hug ll",
+            "commits": commits,
+            "summary": {
+                "total_commits": 2,
+                "date_range": {
+                    "earliest": "2025-11-18T09:00:00Z",
+                    "latest": "2025-11-18T10:00:00Z",
+                },
+            },
+        }
+        out = io.StringIO()
+
+        write_log_json(iter_commits(self.LINES), out)
+
+        assert (
+            out.getvalue() == json.dumps(expected, ensure_ascii=False, separators=(",", ":")) + "\n"
+        )
+
+    def test_write_log_json_without_commits(self):
+        """Test empty input omits the date range"""
+        out = io.StringIO()
+
+        write_log_json(iter_commits([]), out)
+
+        assert json.loads(out.getvalue()) == {
+            "command": "hug ll",
+            "commits": [],
+            "summary": {"total_commits": 0},
+        }
+
+    def test_stream_log_ndjson_writes_one_commit_per_line(self):
+        """Test NDJSON output has one compact commit object per line"""
+        out = io.StringIO()
+
+        stream_log_ndjson(iter_commits(self.LINES), out)
+
+        records = out.getvalue().splitlines()
+        assert [json.loads(r) for r in records] == parse_log_with_stats(self.LINES)
+        assert records[0].startswith(
+            '{"sha":"abc123def456789012345678901234567890abcd","sha_short"'
+        )
+
+    def test_main_reads_stdin_as_a_stream(self, monkeypatch, capsys):
+        """Test the CLI iterates stdin instead of reading it all up front"""
+        monkeypatch.setattr(sys, "argv", ["log_json.py", "--ndjson"])
+        monkeypatch.setattr(sys, "stdin", iter(self.LINES))  # no readlines()
+
+        log_json.main()
+
+        records = capsys.readouterr().out.splitlines()
+        assert [json.loads(r)["sha_short"] for r in records] == ["abc123d", "def456a"]
+
+
+class TestLargeLog:
+    """Test parsing stays correct across a long history"""
+
+    def test_parses_every_commit_with_totals(self, large_log):
+        """Test all 10k commits parse, in order, with per-commit numstat totals"""
+        commits = parse_log_with_stats(large_log)
+
+        assert len(commits) == 10_000
+        assert commits[-1]["sha"] == f"{9_999:040x}"
+        assert commits[-1]["subject"] == "Change 9999"
+        assert sum(c["stats"]["insertions"] for c in commits) == sum(i % 7 for i in range(10_000))
+        assert all(c["stats"]["files_changed"] == 2 for c in commits)
+
+    def test_ndjson_stream_has_one_line_per_commit(self, large_log):
+        """Test streaming writes exactly one NDJSON line per commit"""
+        out = io.StringIO()
+
+        stream_log_ndjson(iter_commits(iter(large_log), include_stats=False), out)
+
+        assert out.getvalue().count("\n") == 10_000
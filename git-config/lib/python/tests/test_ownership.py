@@ -7,11 +7,13 @@ Following Google Python testing best practices:
 - Test edge cases and error conditions
 
 NOTE: These tests focus on the algorithmic functions (calculate_recency_weight,
-calculate_file_ownership) rather than git-invoking functions which require
-subprocess mocking.
+calculate_file_ownership); git-invoking functions are covered with a mocked
+subprocess.run.
 """
 
 import math
+from datetime import datetime
+from unittest.mock import MagicMock, patch
 
 # Import module under test
 import ownership
@@ -370,3 +372,81 @@ class TestEdgeCases:
 
         # Alice (today) should have much higher ownership than Bob (1 day ago)
         assert alice["ownership_pct"] > bob["ownership_pct"]
+
+
+class _FixedNow(datetime):
+    """datetime with a pinned now() so days_ago is deterministic."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 11, 15, 12, 0, 0)
+
+
+class TestGetFileCommitHistory:
+    """Tests for get_file_commit_history parsing of git log output."""
+
+    @patch("ownership.datetime", _FixedNow)
+    @patch("subprocess.run")
+    def test_parses_commits_and_days_ago(self, mock_subprocess):
+        """Should split each line and compute days from the local commit time."""
+        # Arrange
+        mock_subprocess.return_value = MagicMock(
+            stdout=(
+                f"{'a' * 40}|Alice Smith|2024-11-15 09:00:00 -0500\n"
+                f"{'b' * 40}|Bob|2024-11-01 12:00:01 +0200\n"
+                "\n"
+            )
+        )
+
+        # Act
+        commits = ownership.get_file_commit_history("src/auth.js", since="1 year ago")
+
+        # Assert
+        assert commits == [
+            {"hash": "a" * 40, "author": "Alice Smith", "date": "2024-11-15", "days_ago": 0},
+            {"hash": "b" * 40, "author": "Bob", "date": "2024-11-01", "days_ago": 13},
+        ]
+        cmd = mock_subprocess.call_args[0][0]
+        assert cmd[2] == "--since=1 year ago"
+        assert cmd[-2:] == ["--", "src/auth.js"]
+
+    @patch("subprocess.run")
+    def test_repeated_author_shares_one_string(self, mock_subprocess):
+        """Should intern author names so repeated authors share one object."""
+        # Arrange
+        mock_subprocess.return_value = MagicMock(
+            stdout=(
+                f"{'a' * 40}|Alice Smith|2024-11-15 09:00:00 -0500\n"
+                f"{'b' * 40}|Alice Smith|2024-11-01 12:00:00 +0200\n"
+            )
+        )
+
+        # Act
+        commits = ownership.get_file_commit_history("src/auth.js")
+
+        # Assert
+        assert commits[0]["author"] == "Alice Smith"
+        assert commits[0]["author"] is commits[1]["author"]
+
+
+class TestGetAuthorFiles:
+    """Tests for get_author_files parsing of git log --name-only output."""
+
+    @patch("subprocess.run")
+    def test_counts_files_per_commit(self, mock_subprocess):
+        """Should count each path once per commit, skipping blanks and stray lines."""
+        # Arrange
+        mock_subprocess.return_value = MagicMock(
+            stdout=(
+                "stray line before any commit\n"
+                f"{'a' * 40}\n\nsrc/auth.py\nREADME.md\n"
+                f"{'B' * 40}\n\n  src/auth.py  \n"
+                f"{'c' * 40}\n"
+            )
+        )
+
+        # Act
+        result = ownership.get_author_files("Alice")
+
+        # Assert
+        assert result == {"src/auth.py": 2, "README.md": 1}